@@ -0,0 +1,91 @@
+# beam search player: play strength & move time per preview depth and pool size
+# run: python -m benchmarks.bench_ai
+#      python -m benchmarks.bench_ai --games 5 --pieces 500 --budget 0.005
+#
+# every variant plays the same seeded games, lines are the strength, nodes are
+# placements evaluated. a worker pool only pays off with a core per worker,
+# the spawned processes pickle every board they get
+import argparse
+import os
+import random
+import time
+
+from tetris import DROP, LEFT, RIGHT, ROTATE
+from tetris.ai import AIPlayer, play
+from tetris.replay import new_game
+
+# (preview, workers)
+VARIANTS = ((0, 0), (1, 0), (2, 0), (2, 2), (2, 4))
+ACTIONS = [LEFT, RIGHT, DROP, DROP]
+
+
+def check_preview(games=200, spawns=100):
+    # `next_pieces(n)` has to be the next n spawns, also after spawns nobody
+    # peeked at (drops in a row, restarts)
+    rng = random.Random(0)
+    for seed in range(games):
+        game = new_game(seed)
+        spawned = []
+        # (spawns before the peek, pieces it showed)
+        peeks = []
+        while len(spawned) < spawns:
+            if rng.random() < 0.3:
+                peeks.append((len(spawned), game.next_pieces(rng.randrange(1, 4))))
+            pieces = game.pieces
+            game.step(ROTATE if game.is_game_over else rng.choice(ACTIONS))
+            if game.pieces != pieces:
+                spawned.append((game.current_shape_type, game.current_color))
+        for first, shown in peeks:
+            actual = spawned[first : first + len(shown)]
+            assert shown[: len(actual)] == actual, f"seed {seed}: preview is off"
+
+
+def run(preview, workers, games, pieces, budget):
+    player = AIPlayer(budget=budget, preview=preview, workers=workers)
+    start = time.perf_counter()
+    lines = 0
+    played = 0
+    game_overs = 0
+    for seed in range(games):
+        game = play(player, seed, pieces)
+        lines += game.lines
+        played += game.pieces
+        game_overs += game.is_game_over
+    elapsed = time.perf_counter() - start
+    player.close()
+    stats = player.stats()
+    stats.update(
+        lines=lines / games,
+        game_overs=game_overs,
+        pieces_per_second=played / elapsed,
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time the beam search player")
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--pieces", type=int, default=300, help="per game at most")
+    parser.add_argument("--budget", type=float, default=0.005, help="s per move")
+    args = parser.parse_args()
+
+    check_preview()
+    print(f"{os.cpu_count()} cpus, {args.budget * 1000:g} ms budget")
+    print(
+        f"{'preview':>7} {'workers':>7} {'lines':>6} {'overs':>5} {'depth':>5} "
+        f"{'pieces/s':>8} {'nodes/s':>9} {'mean ms':>7} {'max ms':>7} "
+        f"{'over budget':>11}"
+    )
+    for preview, workers in VARIANTS:
+        stats = run(preview, workers, args.games, args.pieces, args.budget)
+        print(
+            f"{preview:7} {workers:7} {stats['lines']:6.1f} {stats['game_overs']:5} "
+            f"{stats['mean_depth']:5.2f} {stats['pieces_per_second']:8,.0f} "
+            f"{stats['nodes_per_second']:9,.0f} "
+            f"{stats['mean_move_ms']:7.2f} {stats['slowest_move_ms']:7.2f} "
+            f"{stats['over_budget']:11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
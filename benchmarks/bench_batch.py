@@ -0,0 +1,104 @@
+# BatchEngine vs one TetrisEngine per game on the same actions
+# run: python -m benchmarks.bench_batch
+#
+# the actions are what the beam search player (no preview) pressed with a
+# random gravity tick here and there, so games clear lines, every
+# `RANDOM_EVERY`th game drops at random, tops out & restarts. every board, shape,
+# position & counter of the batch is checked against its `TetrisEngine`
+# afterwards
+import random
+import time
+
+import numpy as np
+
+from tetris import COLORS, DROP, LEFT, RIGHT, ROTATE, TICK, TetrisEngine
+from tetris.ai import AIPlayer
+from tetris.batch import BatchEngine
+
+GAMES = 1000
+STEPS = 200
+TICK_CHANCE = 0.2
+RANDOM_EVERY = 4
+RANDOM_ACTIONS = [TICK, LEFT, RIGHT, ROTATE, DROP, DROP]
+
+
+def record_actions(games, steps):
+    # -> (steps, games) actions, games that top out early idle on `TICK`
+    player = AIPlayer(preview=0)
+    rng = random.Random(0)
+    actions = np.full((steps, games), TICK, dtype=np.intp)
+    for seed in range(games):
+        if seed % RANDOM_EVERY == RANDOM_EVERY - 1:
+            actions[:, seed] = [rng.choice(RANDOM_ACTIONS) for _ in range(steps)]
+            continue
+        game = TetrisEngine(random.Random(seed))
+        played = []
+        while len(played) < steps and not game.is_game_over:
+            pieces = game.pieces
+            for action in player(game) or [DROP]:
+                if rng.random() < TICK_CHANCE:
+                    played.append(TICK)
+                    game.step(TICK)
+                played.append(action)
+                game.step(action)
+                if game.pieces != pieces or game.is_game_over:
+                    break
+        actions[: min(len(played), steps), seed] = played[:steps]
+    return actions
+
+
+def check_same(games, batch):
+    for i, game in enumerate(games):
+        state = (
+            game.cells.tolist(),
+            game.rules.shape_names.index(game.current_shape_type),
+            game.shape_index,
+            game.current_pos,
+            COLORS.index(game.current_color),
+            game.score,
+            game.lines,
+            game.pieces,
+            game.is_game_over,
+        )
+        batch_state = (
+            batch.colors[i].tolist(),
+            int(batch.shape_type[i]),
+            int(batch.rotation[i]),
+            (int(batch.pos_x[i]), int(batch.pos_y[i])),
+            int(batch.color[i]),
+            int(batch.score[i]),
+            int(batch.lines[i]),
+            int(batch.pieces[i]),
+            bool(batch.is_game_over[i]),
+        )
+        assert state == batch_state, f"game {i} differs"
+
+
+def main():
+    actions = record_actions(GAMES, STEPS)
+
+    games = [TetrisEngine(random.Random(seed)) for seed in range(GAMES)]
+    start = time.perf_counter()
+    for step in actions.tolist():
+        for game, action in zip(games, step):
+            game.step(action)
+    single_time = time.perf_counter() - start
+
+    batch = BatchEngine(range(GAMES))
+    start = time.perf_counter()
+    for step in actions:
+        batch.step(step)
+    batch_time = time.perf_counter() - start
+
+    check_same(games, batch)
+    lines = sum(game.lines for game in games)
+    overs = sum(game.is_game_over for game in games)
+
+    total = GAMES * STEPS
+    print(f"{GAMES} games x {STEPS} steps, {lines} lines, {overs} game overs")
+    print(f"TetrisEngine: {single_time:.3f}s  {total / single_time:,.0f} steps/s")
+    print(f"BatchEngine:  {batch_time:.3f}s  {total / batch_time:,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# move/drop heavy workload on both board backends
+# run: python -m benchmarks.bench_board
+#      python -m benchmarks.bench_board 40x16 60x24   # other board sizes
+import random
+import sys
+import time
+
+from tetris import (
+    DROP,
+    LEFT,
+    RIGHT,
+    ROTATE,
+    TICK,
+    BitBoard,
+    GridBoard,
+    TetrisEngine,
+    get_rules,
+)
+
+GAMES = 200
+ACTIONS = [TICK, LEFT, LEFT, RIGHT, RIGHT, ROTATE, TICK, DROP]
+
+
+def play(board_cls, rules, seed):
+    game = TetrisEngine(random.Random(seed), board_cls(rules))
+    moves = random.Random(seed + GAMES)
+    steps = 0
+    while not game.is_game_over:
+        game.step(moves.choice(ACTIONS))
+        steps += 1
+    return steps, game.score, game.pieces
+
+
+def bench(board_cls, rules):
+    start = time.perf_counter()
+    results = [play(board_cls, rules, seed) for seed in range(GAMES)]
+    return time.perf_counter() - start, results
+
+
+def main(sizes):
+    for size in sizes:
+        rules = get_rules(*map(int, size.split("x")))
+        grid_time, grid_results = bench(GridBoard, rules)
+        bit_time, bit_results = bench(BitBoard, rules)
+        assert grid_results == bit_results, "boards disagree"
+
+        steps = sum(r[0] for r in grid_results)
+        print(f"{size}: {GAMES} games, {steps} steps")
+        print(f"GridBoard: {grid_time:.3f}s  {steps / grid_time:,.0f} steps/s")
+        print(f"BitBoard:  {bit_time:.3f}s  {steps / bit_time:,.0f} steps/s")
+        print(f"speedup:   {grid_time / bit_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["20x10"])
@@ -0,0 +1,64 @@
+# vectorized environment throughput: env steps/s inline vs worker processes
+# run: python -m benchmarks.bench_env
+#      python -m benchmarks.bench_env 16 64 256 --workers 0 1 2 4 --steps 500
+#
+# random actions, one `step(actions)` per batch, auto resets included. the
+# inline row (workers 0) is the single process baseline, same arrays and
+# games without processes or shared memory. workers only pay off with a core
+# each, every step costs a pipe round trip per worker
+import argparse
+import os
+import time
+
+import numpy as np
+
+from tetris.env import ACTION_COUNT, VectorEnv
+
+ENVS = (16, 64, 256)
+STEPS = 500
+
+
+def run(count, workers, steps):
+    env = VectorEnv(list(range(count)), workers=workers)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(ACTION_COUNT, size=(steps, count))
+    env.reset()
+    episodes = 0
+    start = time.perf_counter()
+    for batch in actions:
+        _, _, dones, _ = env.step(batch)
+        episodes += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps * count / elapsed, episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time the vectorized env")
+    parser.add_argument("envs", nargs="*", type=int, default=ENVS)
+    parser.add_argument("--workers", nargs="*", type=int, default=None)
+    parser.add_argument("--steps", type=int, default=STEPS, help="batches per run")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers
+    if workers is None:
+        workers = sorted({0, 1, cpus})
+    print(f"{cpus} cpus, {args.steps} steps per run")
+    print(
+        f"{'envs':>6} {'workers':>7} {'steps/s':>10} {'vs inline':>9} "
+        f"{'episodes':>8}"
+    )
+    for count in args.envs:
+        baseline = None
+        for w in workers:
+            rate, episodes = run(count, w, args.steps)
+            if baseline is None:
+                baseline = rate
+            print(
+                f"{count:6} {w:7} {rate:10,.0f} {rate / baseline:8.2f}x {episodes:8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
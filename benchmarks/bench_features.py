@@ -0,0 +1,107 @@
+# board features over stacks of boards vs a per cell python loop
+# run: python -m benchmarks.bench_features
+import time
+
+import numpy as np
+
+from tetris.constants import GRID_COL, GRID_ROW
+from tetris.features import FEATURES, board_features
+
+SIZES = (1, 1000, 100000)
+SCALAR_BOARDS = 1000
+SEED = 0
+
+
+def random_boards(n, rng):
+    # bottom heavy boards with holes & a few full rows, like mid game states
+    fill = np.linspace(0.95, -0.6, GRID_ROW)[None, :, None]
+    boards = rng.random((n, GRID_ROW, GRID_COL)) < fill
+    full = rng.random((n, GRID_ROW)) < 0.05
+    boards[full] = True
+    return boards
+
+
+def scalar_features(board):
+    # the same features one cell at a time
+    rows, cols = len(board), len(board[0])
+    heights = []
+    for c in range(cols):
+        height = 0
+        for r in range(rows):
+            if board[r][c]:
+                height = r + 1
+        heights.append(height)
+
+    holes = 0
+    for c in range(cols):
+        for r in range(heights[c]):
+            if not board[r][c]:
+                holes += 1
+
+    row_transitions = 0
+    for r in range(rows):
+        prev = True
+        for c in range(cols):
+            if board[r][c] != prev:
+                row_transitions += 1
+            prev = board[r][c]
+        if not prev:
+            row_transitions += 1
+
+    column_transitions = 0
+    for c in range(cols):
+        prev = True
+        for r in range(rows):
+            if board[r][c] != prev:
+                column_transitions += 1
+            prev = board[r][c]
+
+    wells = 0
+    for c in range(cols):
+        left = heights[c - 1] if c > 0 else rows
+        right = heights[c + 1] if c < cols - 1 else rows
+        wells += max(0, min(left, right) - heights[c])
+
+    return {
+        "aggregate_height": sum(heights),
+        "holes": holes,
+        "bumpiness": sum(abs(a - b) for a, b in zip(heights, heights[1:])),
+        "row_transitions": row_transitions,
+        "column_transitions": column_transitions,
+        "wells": wells,
+        "complete_lines": sum(all(row) for row in board),
+    }
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rng = np.random.default_rng(SEED)
+
+    boards = random_boards(SCALAR_BOARDS, rng)
+    rows = boards.tolist()
+    features = board_features(boards)
+    for i, board in enumerate(rows):
+        expected = scalar_features(board)
+        assert all(features[name][i] == expected[name] for name in FEATURES), i
+
+    elapsed = best_time(lambda: [scalar_features(board) for board in rows], 3)
+    rate = SCALAR_BOARDS / elapsed
+    print(f"python loop    N={SCALAR_BOARDS:<7} {rate:13,.0f} boards/s")
+
+    for n in SIZES:
+        boards = random_boards(n, rng)
+        repeat = max(3, min(1000, 100000 // n))
+        elapsed = best_time(lambda: board_features(boards), repeat)
+        print(f"board_features N={n:<7} {n / elapsed:13,.0f} boards/s")
+
+
+if __name__ == "__main__":
+    main()
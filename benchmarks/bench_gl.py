@@ -0,0 +1,133 @@
+# glDrawPixels of the CPU window vs TextureRenderer, on an offscreen software
+# GL context (no display or GPU needed), checks both draw the same pixels
+# run: python -m benchmarks.bench_gl
+#      PYOPENGL_PLATFORM=osmesa python -m benchmarks.bench_gl
+import os
+
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import ctypes
+import random
+import time
+
+import numpy as np
+from OpenGL.GL import (
+    GL_COLOR_BUFFER_BIT,
+    GL_PACK_ALIGNMENT,
+    GL_RENDERER,
+    GL_RGB,
+    GL_UNSIGNED_BYTE,
+    glClear,
+    glDrawPixels,
+    glFinish,
+    glGetString,
+    glPixelStorei,
+    glRasterPos2f,
+    glReadPixels,
+)
+
+from tetris import DROP, LEFT, RIGHT, ROTATE, TICK, TetrisEngine
+from tetris.gl_render import TextureRenderer
+from tetris.render import GridRenderer
+
+FRAMES = 500
+ACTIONS = [TICK, LEFT, RIGHT, ROTATE, TICK, DROP]
+
+
+def make_context(width, height):
+    # keeps a reference to whatever the platform needs alive
+    if os.environ["PYOPENGL_PLATFORM"] == "osmesa":
+        from OpenGL import arrays, osmesa
+
+        context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        osmesa.OSMesaMakeCurrent(context, buffer, GL_UNSIGNED_BYTE, width, height)
+        return context, buffer
+
+    from OpenGL import EGL
+
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    EGL.eglInitialize(display, None, None)
+    attributes = (EGL.EGLint * 11)(
+        EGL.EGL_SURFACE_TYPE,
+        EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE,
+        8,
+        EGL.EGL_GREEN_SIZE,
+        8,
+        EGL.EGL_BLUE_SIZE,
+        8,
+        EGL.EGL_RENDERABLE_TYPE,
+        EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE,
+    )
+    config = EGL.EGLConfig()
+    count = EGL.EGLint()
+    EGL.eglChooseConfig(display, attributes, ctypes.pointer(config), 1, count)
+
+    size = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+    surface = EGL.eglCreatePbufferSurface(display, config, size)
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+    EGL.eglMakeCurrent(display, surface, surface, context)
+    return display, surface, context
+
+
+def read_pixels(width, height):
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    data = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+
+
+def play(renderer, draw):
+    game = TetrisEngine(random.Random(0))
+    moves = random.Random(1)
+    frames = []
+
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        game.step(moves.choice(ACTIONS))
+        if game.is_game_over:
+            game.game_restart()
+        renderer.render(game)
+        draw(renderer)
+        glFinish()
+        if i % 50 == 0:
+            frames.append(read_pixels(renderer.width, renderer.height))
+    return time.perf_counter() - start, frames
+
+
+def draw_pixels(renderer):
+    glClear(GL_COLOR_BUFFER_BIT)
+    glRasterPos2f(-1, -1)
+    glDrawPixels(
+        renderer.width, renderer.height, GL_RGB, GL_UNSIGNED_BYTE, renderer.window
+    )
+
+
+def main():
+    cpu = GridRenderer()
+    texture = TextureRenderer()
+    _context = make_context(cpu.width, cpu.height)
+    print("GL renderer:", glGetString(GL_RENDERER).decode())
+
+    cpu_time, cpu_frames = play(cpu, draw_pixels)
+    texture_time, texture_frames = play(texture, TextureRenderer.draw)
+
+    mismatched = sum(
+        int((a != b).any(axis=2).sum()) for a, b in zip(cpu_frames, texture_frames)
+    )
+    print(f"{FRAMES} frames, {mismatched} mismatched pixels")
+    print(
+        f"glDrawPixels:    {cpu_time / FRAMES * 1000:.3f} ms/frame  "
+        f"{cpu.window.nbytes} bytes/frame"
+    )
+    print(
+        f"TextureRenderer: {texture_time / FRAMES * 1000:.3f} ms/frame  "
+        f"{texture.uploaded_bytes / FRAMES:.0f} bytes/frame"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# repaints per displayed frame, input callback repaints vs `GameLoop` frames
+#
+# a simulated minute of play: key repeat bursts at `KEY_RATE` presses per
+# second, gravity ticks, a display at `FPS`
+# run: python -m benchmarks.bench_loop
+import random
+import time
+
+from tetris import LEFT, RIGHT, ROTATE, TICK
+from tetris.loop import GameLoop
+from tetris.render import GridRenderer
+from tetris.replay import new_game
+
+SECONDS = 60
+FPS = 60
+KEY_RATE = 200
+SEED = 7
+
+
+def events():
+    # (time, action) sorted, bursts of one held key with pauses in between
+    moves = random.Random(SEED)
+    out = [(float(t), TICK) for t in range(1, SECONDS)]
+    t = 0.0
+    while t < SECONDS:
+        key = moves.choice([LEFT, RIGHT, ROTATE])
+        for _ in range(moves.randint(2, 12)):
+            t += 1 / KEY_RATE
+            out.append((t, key))
+        t += moves.uniform(0.1, 0.5)
+    return sorted(out)
+
+
+def per_event(timeline):
+    # old frontend: every key press & tick repaints right away
+    game = new_game(SEED)
+    renderer = GridRenderer()
+    for _, action in timeline:
+        game.step(action)
+        renderer.render(game)
+    return len(timeline), game
+
+
+def per_frame(timeline):
+    # keys queued, played and drawn once per display frame
+    game = new_game(SEED)
+    renderer = GridRenderer()
+    loop = GameLoop(game)
+    loop.advance(0.0)
+
+    repaints = 0
+    i = 0
+    for frame in range(1, SECONDS * FPS + 1):
+        now = frame / FPS
+        while i < len(timeline) and timeline[i][0] <= now:
+            if timeline[i][1] != TICK:
+                loop.push(timeline[i][1])
+            i += 1
+        if loop.advance(now):
+            renderer.render(game)
+            repaints += 1
+    return repaints, game
+
+
+def main():
+    timeline = events()
+    for name, run in (("per event", per_event), ("per frame", per_frame)):
+        start = time.perf_counter()
+        repaints, game = run(timeline)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name}: {repaints} repaints, {repaints / SECONDS:.1f}/s, "
+            f"{elapsed * 1000:.0f} ms, score {game.score} pieces {game.pieces}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# placements per second of the move generator, cold and cached
+# run: python -m benchmarks.bench_movegen
+import time
+
+import numpy as np
+
+from tetris.constants import GRID_COL, GRID_ROW, SHAPE_NAMES
+from tetris.movegen import MoveGenerator
+from tetris.rules import DEFAULT_RULES
+
+BOARDS = 200
+
+
+def random_boards():
+    # ragged stacks up to half the grid with holes, no full rows
+    rng = np.random.default_rng(0)
+    boards = []
+    for _ in range(BOARDS):
+        grid = np.zeros((GRID_ROW, GRID_COL), dtype=bool)
+        height = rng.integers(0, GRID_ROW // 2)
+        grid[:height] = rng.random((height, GRID_COL)) < 0.7
+        grid[grid.all(axis=1), rng.integers(GRID_COL)] = False
+        boards.append(tuple(grid.dot(DEFAULT_RULES.col_bits).tolist()))
+    return boards
+
+
+def run(generator, boards):
+    count = 0
+    start = time.perf_counter()
+    for rows in boards:
+        for shape_type in SHAPE_NAMES:
+            count += len(generator.placements(rows, shape_type))
+    return count, time.perf_counter() - start
+
+
+def main():
+    boards = random_boards()
+    generator = MoveGenerator(cache_size=len(boards) * len(SHAPE_NAMES))
+
+    count, cold = run(generator, boards)
+    _, cached = run(generator, boards)
+
+    searches = len(boards) * len(SHAPE_NAMES)
+    print(f"{searches} searches, {count} placements")
+    print(f"cold:   {count / cold:,.0f} placements/s")
+    print(f"cached: {count / cached:,.0f} placements/s")
+    stats = generator.cache.stats()
+    print(
+        f"cache hits {stats['hits']} misses {stats['misses']} "
+        f"hit rate {stats['hit_rate']:.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
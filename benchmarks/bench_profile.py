@@ -0,0 +1,67 @@
+# cost of the profiler on a frame, enabled vs none, and its disabled hooks
+# run: python -m benchmarks.bench_profile
+import time
+import timeit
+
+from tetris import LEFT, RIGHT
+from tetris.loop import GameLoop
+from tetris.profiling import Profiler
+from tetris.render import GridRenderer
+from tetris.replay import new_game
+
+FRAMES = 2000
+REPEAT = 9
+SEED = 3
+
+
+def run(profiler):
+    # a key press & a repaint every frame, a gravity tick every half second
+    game = new_game(SEED)
+    renderer = GridRenderer()
+    loop = GameLoop(game, gravity=0.5)
+    if profiler is not None:
+        profiler.instrument(game, "update_current_shape", "get_ghost_shape")
+        renderer.compose = profiler.timed("fill_occupied_grid", renderer.compose)
+
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        if profiler is not None:
+            profiler.frame()
+            profiler.input()
+        loop.push(LEFT if i % 4 < 2 else RIGHT)
+        if loop.advance(i / 60):
+            if profiler is not None:
+                profiler.inputs_played()
+            renderer.render(game)
+            if profiler is not None:
+                profiler.presented()
+    return time.perf_counter() - start
+
+
+def hook_cost(profiler):
+    # the calls a frame makes into a profiler, on their own, in seconds
+    def hooks():
+        profiler.frame()
+        profiler.input()
+        profiler.inputs_played()
+        profiler.presented()
+
+    return min(timeit.repeat(hooks, number=10000, repeat=REPEAT)) / 10000
+
+
+def main():
+    # interleaved, so machine noise hits both alike
+    plain = enabled = float("inf")
+    for _ in range(REPEAT):
+        plain = min(plain, run(None))
+        enabled = min(enabled, run(Profiler(True)))
+
+    frame = plain / FRAMES
+    hooks = hook_cost(Profiler())
+    print(f"frame, no profiler  {frame * 1e6:8.2f} us")
+    print(f"frame, enabled      {enabled / FRAMES * 1e6:8.2f} us")
+    print(f"disabled hooks      {hooks * 1e6:8.2f} us  {hooks / frame:.3%} of a frame")
+
+
+if __name__ == "__main__":
+    main()
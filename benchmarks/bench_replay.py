@@ -0,0 +1,100 @@
+# replay size & full speed replay, per board size
+# run: python -m benchmarks.bench_replay
+#      python -m benchmarks.bench_replay 20x10 40x16
+#
+# every game is recorded while it's played, then checked: decoding gives back
+# its seed, board size & actions, and replaying it ends on the same board,
+# score, lines & pieces. the beam search player (no preview) plays with
+# gravity ticks in between, every `RANDOM_EVERY`th game presses random keys,
+# tops out & restarts (`ROTATE`), some replays end on gravity ticks only
+import random
+import sys
+import time
+
+from tetris import DROP, LEFT, RIGHT, ROTATE, ROTATE_CW, TICK
+from tetris.ai import AIPlayer
+from tetris.replay import ReplayRecorder, decode_replay, new_game, replay
+from tetris.rules import get_rules
+
+GAMES = 20
+ACTIONS_PER_GAME = 2000
+SIZES = ["20x10", "40x16"]
+TICK_CHANCE = 0.5
+RANDOM_EVERY = 4
+RANDOM_ACTIONS = [TICK] * 6 + [LEFT, RIGHT, ROTATE, ROTATE_CW, DROP]
+
+
+def record_game(seed, rules, count, moves, player=None):
+    # -> (replay bytes, actions, the game as it ended), random keys without
+    # a `player`
+    game = new_game(seed, rules=rules)
+    recorder = ReplayRecorder(seed, rules)
+    actions = []
+    keys = []
+    while len(actions) < count:
+        if player is None or game.is_game_over:
+            action = moves.choice(RANDOM_ACTIONS)
+        elif moves.random() < TICK_CHANCE:
+            action = TICK
+        else:
+            if not keys:
+                keys = list(player(game) or [DROP])
+            action = keys.pop(0)
+        pieces = game.pieces
+        game.step(action)
+        recorder.record(action)
+        actions.append(action)
+        # a tick may have locked the shape the keys were for
+        if game.pieces != pieces:
+            keys = []
+    # trailing gravity ticks only, flushed by the `END` record
+    if moves.random() < 0.5:
+        for _ in range(moves.randrange(1, 50)):
+            game.step(TICK)
+            recorder.record(TICK)
+            actions.append(TICK)
+    return recorder.to_bytes(), actions, game
+
+
+def check_replay(data, seed, rules, actions, game):
+    assert decode_replay(data) == (seed, rules, actions), f"seed {seed}: decode"
+    replayed = replay(data)
+    played = (game.cells.tolist(), game.score, game.lines, game.pieces)
+    again = (replayed.cells.tolist(), replayed.score, replayed.lines, replayed.pieces)
+    assert again == played, f"seed {seed}: replay ends elsewhere"
+
+
+def main(sizes):
+    for size in sizes:
+        rules = get_rules(*map(int, size.split("x")))
+        moves = random.Random(size)
+        player = AIPlayer(rules, preview=0)
+        # small and full 63 bit seeds, varints of every length
+        seeds = [moves.randrange(1 << (1 + 62 * i // GAMES)) for i in range(GAMES)]
+        recorded = []
+        for i, seed in enumerate(seeds):
+            policy = None if i % RANDOM_EVERY == RANDOM_EVERY - 1 else player
+            data, actions, game = record_game(
+                seed, rules, ACTIONS_PER_GAME, moves, policy
+            )
+            check_replay(data, seed, rules, actions, game)
+            recorded.append((data, actions, game))
+        player.close()
+
+        start = time.perf_counter()
+        for data, _, _ in recorded:
+            replay(data)
+        elapsed = time.perf_counter() - start
+
+        steps = sum(len(actions) for _, actions, _ in recorded)
+        size_bytes = sum(len(data) for data, _, _ in recorded)
+        lines = sum(game.lines for _, _, game in recorded)
+        print(
+            f"{size:>6}: {GAMES} replays, {steps} actions in {size_bytes} bytes "
+            f"({size_bytes / steps:.2f} bytes/action), {lines} lines, "
+            f"{steps / elapsed:,.0f} actions/s"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or SIZES)
@@ -0,0 +1,85 @@
+# game server under load: key to update latency & sessions one core can host
+# run: python -m benchmarks.bench_server
+#      python -m benchmarks.bench_server 100 1000 5000 --rate 2 --duration 10
+#
+# the server runs in its own process, its cpu time during the load (from
+# /proc, or the whole process from `getrusage` elsewhere) over the wall time
+# is the share of a core the sessions took, sessions per core extrapolates
+# that to 100%. client and server share the machine, on few cores the load
+# generator slows the server down too
+import argparse
+import asyncio
+import os
+import resource
+import signal
+import subprocess
+import sys
+import time
+
+from tetris.client import PERCENTILES, run_load
+
+SESSIONS = (100, 1000, 5000)
+RATE = 2.0
+DURATION = 10.0
+
+
+def cpu_seconds(pid):
+    # user + system time of a running process, None without /proc
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def children_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run(sessions, rate, duration, gravity):
+    before = children_cpu()
+    command = [sys.executable, "-m", "tetris.server", "--port", "0"]
+    command += ["--gravity", str(gravity), "--seed", "0"]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    port = int(server.stdout.readline().rsplit(":", 1)[1])
+
+    cpu_start = cpu_seconds(server.pid)
+    start = time.perf_counter()
+    stats = asyncio.run(run_load(sessions, rate, duration, port=port))
+    elapsed = time.perf_counter() - start
+    cpu_end = cpu_seconds(server.pid)
+
+    server.send_signal(signal.SIGINT)
+    server.communicate()
+    if cpu_start is None:
+        cpu = children_cpu() - before
+    else:
+        cpu = cpu_end - cpu_start
+    stats["server_cpu"] = cpu / elapsed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load the game server")
+    parser.add_argument("sessions", nargs="*", type=int, default=SESSIONS)
+    parser.add_argument("--rate", type=float, default=RATE, help="keys/s per session")
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--gravity", type=float, default=1.0, help="s per row")
+    args = parser.parse_args()
+
+    latency = "  ".join(f"{f'p{p} ms':>7}" for p in PERCENTILES)
+    print(f"{'sessions':>8} {'keys/s':>8} {latency}  {'cpu':>5} {'sessions/core':>13}")
+    for sessions in args.sessions:
+        stats = run(sessions, args.rate, args.duration, args.gravity)
+        latency = "  ".join(f"{stats[f'p{p}_ms']:7.2f}" for p in PERCENTILES)
+        cpu = stats["server_cpu"]
+        print(
+            f"{sessions:8} {stats['keys_per_second']:8,.0f} {latency}  {cpu:5.0%} "
+            f"{sessions / max(cpu, 1e-9):13,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# snapshot/restore vs deepcopy & pickle, and scanning a mapped corpus
+# run: python -m benchmarks.bench_snapshot
+import copy
+import os
+import pickle
+import random
+import tempfile
+import time
+import timeit
+
+from tetris import DROP, LEFT, RIGHT, ROTATE, TICK
+from tetris.replay import new_game
+from tetris.snapshot import load_snapshots, new_snapshots, restore, snapshot
+
+CORPUS = 20000
+SEED = 5
+ACTIONS = [TICK, LEFT, RIGHT, ROTATE, TICK, DROP]
+
+
+def time_us(op, number=2000):
+    return min(timeit.repeat(op, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    game = new_game(SEED)
+    moves = random.Random(SEED)
+    for _ in range(300):
+        game.step(moves.choice(ACTIONS))
+
+    snap = snapshot(game)
+    other = new_game(SEED + 1)
+    data = pickle.dumps(game)
+
+    print(f"snapshot size      {snap.nbytes:8} bytes, pickle {len(data)} bytes")
+    print(f"snapshot           {time_us(lambda: snapshot(game, snap)):8.2f} us")
+    print(f"restore            {time_us(lambda: restore(other, snap)):8.2f} us")
+    print(f"copy.deepcopy      {time_us(lambda: copy.deepcopy(game), 500):8.2f} us")
+    round_trip = time_us(lambda: pickle.loads(pickle.dumps(game)), 500)
+    print(f"pickle round trip  {round_trip:8.2f} us")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.npy")
+        snaps = new_snapshots(CORPUS, path=path)
+        start = time.perf_counter()
+        for i in range(CORPUS):
+            game.step(moves.choice(ACTIONS))
+            if game.is_game_over:
+                game.game_restart()
+            snapshot(game, snaps[i])
+        snaps.flush()
+        del snaps
+        written = time.perf_counter() - start
+
+        start = time.perf_counter()
+        corpus = load_snapshots(path)
+        filled = (corpus["cells"] != 0).sum(axis=(1, 2))
+        over = int(corpus["is_game_over"].sum())
+        scanned = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+    print(
+        f"wrote {CORPUS} snapshots, {size / 2**20:.1f} MiB in {written:.2f}s, "
+        f"{CORPUS / written:,.0f}/s"
+    )
+    print(
+        f"scanned cells & flags in {scanned * 1000:.1f} ms, "
+        f"{CORPUS / scanned:,.0f} snapshots/s, mean filled {filled.mean():.1f}, "
+        f"{over} game over"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# startup cost: engine import time & time to the first frame, each in a fresh
+# interpreter, import times from `python -X importtime`
+#
+# run: python -m benchmarks.bench_startup
+#      python -m benchmarks.bench_startup --runs 20
+#
+# the GLUT frame needs a display, without one only the headless frame (engine
+# import, game & first `GridRenderer` frame) is timed
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 10
+TOP = 6
+
+HEADLESS_FRAME = """
+import time
+from tetris.render import GridRenderer
+from tetris.replay import new_game
+GridRenderer().render(new_game(1))
+print(f"first frame {time.time():.6f}")
+"""
+
+
+def import_times(module):
+    # {name: (self us, cumulative us)} for one `import module` in a new python
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, total, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(own), int(total))
+    return times
+
+
+def first_frame(command):
+    # seconds from spawning `command` until it prints "first frame <time.time()>"
+    start = time.time()
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("first frame "):
+            return float(line.split()[-1]) - start
+    raise RuntimeError(f"no frame from {command}: {result.stderr.strip()}")
+
+
+def report(label, samples):
+    ms = [sample * 1000 for sample in samples]
+    print(f"{label:28} min {min(ms):7.1f} ms  median {statistics.median(ms):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time imports & first frame")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    runs = [import_times("tetris") for _ in range(args.runs)]
+    report("import tetris", [times["tetris"][1] / 1e6 for times in runs])
+    report("  of which numpy", [times["numpy"][1] / 1e6 for times in runs])
+    gl = [import_times("tetris.app") for _ in range(args.runs)]
+    report("import tetris.app (GL)", [times["tetris.app"][1] / 1e6 for times in gl])
+
+    # slowest modules of the last engine import by their own time
+    times = runs[-1]
+    print(f"{'':28} {'self us':>8} {'cumul us':>9}")
+    slowest = sorted(times.items(), key=lambda item: -item[1][0])[:TOP]
+    for name, (own, total) in slowest:
+        print(f"  {name:26} {own:8} {total:9}")
+    opengl = sorted(name for name in times if name.startswith("OpenGL"))
+    print(f"OpenGL modules loaded by the engine: {len(opengl)}")
+
+    python = [sys.executable, "-c", "import time; print(f'first frame {time.time()}')"]
+    report("python startup", [first_frame(python) for _ in range(args.runs)])
+    headless = [sys.executable, "-c", HEADLESS_FRAME]
+    report("first frame, headless", [first_frame(headless) for _ in range(args.runs)])
+
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        print("first frame, GLUT: no display, skipped")
+        return
+    window = [sys.executable, "-m", "tetris", "--seed", "1", "--first-frame"]
+    report("first frame, GLUT", [first_frame(window) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
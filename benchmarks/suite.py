@@ -0,0 +1,245 @@
+# per operation latency, frame cost and memory per game on fixed scenarios
+#
+# run: python -m benchmarks.suite
+#      python -m benchmarks.suite --save baseline.json
+#      python -m benchmarks.suite --compare baseline.json   # exit 1 on regression
+#      python -m benchmarks.suite --gl                      # + glDrawPixels
+#
+# every op is timed on its scenario as built, the game & renderer are restored
+# before and after it, ops that change the game restore it on every call (the
+# `restore` op is what that costs)
+import argparse
+import json
+import random
+import sys
+import timeit
+import tracemalloc
+from itertools import cycle
+
+import numpy as np
+
+from tetris import DROP, LEFT, RIGHT, ROTATE, TICK, SHAPES
+from tetris.constants import GRID_COL, GRID_ROW
+from tetris.render import GridRenderer
+from tetris.replay import new_game
+from tetris.snapshot import restore, snapshot
+
+SEED = 1234
+# slower than baseline by more than this fails `--compare`
+THRESHOLD = 1.5
+# saved with baselines, `--compare` refuses ones of another version
+# 2: ops timed on their scenario, `full_rows`
+VERSION = 2
+
+
+def empty_game():
+    return new_game(SEED)
+
+
+def half_full_game():
+    game = new_game(SEED)
+    rng = np.random.default_rng(SEED)
+    half = GRID_ROW // 2
+    cells = rng.random((half, GRID_COL)) < 0.7
+    cells[cells.all(axis=1), 0] = False
+    game.cells[:half][cells] = 1
+    game.board.update_cells()
+    return game
+
+
+def tetris_ready_game():
+    # four rows full but the last column, an I shape above it
+    game = new_game(SEED)
+    game.cells[:4, :-1] = 2
+    game.board.update_cells()
+    game.current_shape_type = "I"
+    game.shape_index = 0
+    game.current_shape = SHAPES["I"][0]
+    game.current_pos = (GRID_ROW - 4, GRID_COL - 2)
+    return game
+
+
+def full_rows_game():
+    # four full rows under the spawned shape, `update_score` clears them
+    game = new_game(SEED)
+    game.cells[:4] = 2
+    game.board.update_cells()
+    return game
+
+
+def game_over_game():
+    game = new_game(SEED)
+    moves = random.Random(SEED)
+    while not game.is_game_over:
+        game.step(moves.choice([TICK, LEFT, RIGHT, ROTATE, DROP]))
+    return game
+
+
+SCENARIOS = {
+    "empty": empty_game,
+    "half_full": half_full_game,
+    "tetris_ready": tetris_ready_game,
+    "full_rows": full_rows_game,
+    "game_over": game_over_game,
+}
+
+
+def operations(game, draw_pixels=None):
+    # -> (name -> callable, prepare), `prepare()` puts the game & renderer
+    # back to the scenario, ops that change the game restore it themselves
+    state = snapshot(game)
+    renderer = GridRenderer()
+    renderer.render(game)
+
+    def reset():
+        restore(game, state)
+
+    def prepare():
+        reset()
+        renderer.render(game)
+
+    # a neighbour column the shape fits in between the walls, it stays put
+    # when there's none
+    x, y = game.current_pos
+    rules = game.rules
+    min_dy, max_dy = rules.shape_bounds[game.current_shape_type][game.shape_index]
+    side = y + 1 if y + 1 + max_dy < rules.grid_col else y - 1
+    columns = [side, y] if side + min_dy >= 0 else [y]
+    positions = cycle((x, column) for column in columns)
+
+    def update_score():
+        reset()
+        game.update_score()
+
+    def move_bottom():
+        reset()
+        game.move_bottom()
+
+    def change_shape():
+        reset()
+        game.change_shape()
+
+    def update_current_shape():
+        # a moving shape, ghost & shape cells repainted every frame
+        renderer.render(game)
+        game.current_pos = next(positions)
+
+    def full_repaint():
+        GridRenderer().render(game)
+
+    def frame():
+        reset()
+        game.step(TICK)
+        renderer.render(game)
+        if draw_pixels is not None:
+            draw_pixels(renderer)
+
+    ops = {
+        "restore": reset,
+        "get_ghost_shape": game.get_ghost_shape,
+        "update_score": update_score,
+        "move_bottom": move_bottom,
+        "fill_occupied_grid": lambda: renderer.compose(game),
+        "update_current_shape": update_current_shape,
+        "full_repaint": full_repaint,
+        "draw_grid_lines": renderer.draw_grid_lines,
+        "frame": frame,
+        "change_shape": change_shape,
+    }
+    if draw_pixels is not None:
+        ops["fill_buffer"] = lambda: draw_pixels(renderer)
+    return ops, prepare
+
+
+def time_op(op, repeat=7, target=0.05):
+    # best of `repeat` runs of about `target` seconds, in microseconds per call
+    timer = timeit.Timer(op)
+    number = max(1, int(target / max(timer.timeit(1), 1e-7)))
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def memory_per_game(count=200):
+    # bytes allocated per headless game, and per game with a CPU framebuffer
+    results = {}
+    for name, make in (
+        ("engine", lambda seed: new_game(seed)),
+        ("engine+renderer", lambda seed: (new_game(seed), GridRenderer())),
+    ):
+        tracemalloc.start()
+        games = [make(seed) for seed in range(count)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del games
+        results[name] = size / count
+    return results
+
+
+def run(draw_pixels=None):
+    results = {}
+    for scenario, make in SCENARIOS.items():
+        ops, prepare = operations(make(), draw_pixels)
+        for name, op in ops.items():
+            prepare()
+            results[f"{scenario}.{name}"] = time_op(op)
+            prepare()
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, value in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = value / base
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:40} {base:10.2f} -> {value:10.2f} us  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tetris benchmark suite")
+    parser.add_argument("--save", help="write results as a baseline json")
+    parser.add_argument("--compare", help="baseline json to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--gl", action="store_true", help="time glDrawPixels")
+    args = parser.parse_args()
+
+    draw_pixels = None
+    if args.gl:
+        from .bench_gl import draw_pixels, make_context
+
+        renderer = GridRenderer()
+        _context = make_context(renderer.width, renderer.height)
+
+    results = run(draw_pixels)
+    memory = memory_per_game()
+
+    for name, value in results.items():
+        print(f"{name:40} {value:10.2f} us")
+    for scenario in SCENARIOS:
+        frame = results[f"{scenario}.frame"]
+        print(f"{scenario:40} {1e6 / frame:10.0f} frames/s")
+    for name, size in memory.items():
+        print(f"memory per game, {name:23} {size:10.0f} bytes")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            baseline = {"version": VERSION, "timings": results, "memory": memory}
+            json.dump(baseline, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("version") != VERSION:
+            sys.exit(f"{args.compare} is from another suite version, save it again")
+        regressions = compare(results, baseline["timings"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions over x{args.threshold}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 # Rebuild the game but,
 # todo: remote unnecessary code
-# todo: bix bug(rotation issue of I block)
-# todo: add preview of next block
 # todo: live display of score
 # todo: remove OOP if possible
 # deadlines: 25/01/2024
@@ -0,0 +1,14 @@
+# headless tetris engine, importable without OpenGL/GLUT
+from .board import BitBoard, GridBoard
+from .constants import COLORS, GRID_COL, GRID_EMPTY_CELL, GRID_ROW, SHAPES
+from .engine import (
+    DROP,
+    KEY_ACTIONS,
+    LEFT,
+    RIGHT,
+    ROTATE,
+    ROTATE_CW,
+    TICK,
+    TetrisEngine,
+)
+from .rules import DEFAULT_RULES, PIECE_SETS, Rules, get_rules
@@ -0,0 +1,81 @@
+# python -m tetris [--seed N] [--record FILE] [--size 40x16] [--texture] ...
+#
+# options are parsed before anything loads OpenGL, GL & GLUT come in with
+# `tetris.app` right before the window opens
+import argparse
+
+from .loop import GRAVITY, SPEEDUP
+from .replay import new_seed
+
+
+def board_size(value):
+    # "40x16" -> (40, 16), rows first
+    rows, _, cols = value.partition("x")
+    return int(rows), int(cols)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="tetris", description="play tetris")
+    parser.add_argument(
+        "--seed", type=int, default=None, help="replays the same shapes"
+    )
+    parser.add_argument("--record", help="save a replay here on quit")
+    parser.add_argument(
+        "--size", type=board_size, default=(20, 10), help="ROWSxCOLS, 20x10"
+    )
+    parser.add_argument(
+        "--texture", action="store_true", help="draw with a GL texture"
+    )
+    parser.add_argument(
+        "--fps", type=int, default=60, help="frames drawn per second at most"
+    )
+    parser.add_argument(
+        "--gravity", type=float, default=GRAVITY, help="seconds per row at level 0"
+    )
+    parser.add_argument(
+        "--speedup", type=float, default=SPEEDUP, help="gravity factor per level"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="stage timings over the board"
+    )
+    parser.add_argument(
+        "--profile-dump", help="write timings here, prometheus text for .prom"
+    )
+    parser.add_argument(
+        "--preview", type=int, default=None, help="show the next N shapes"
+    )
+    parser.add_argument(
+        "--ai", action="store_true", help="let the beam search play"
+    )
+    parser.add_argument(
+        "--ai-budget", type=float, default=0.005, help="seconds per AI move"
+    )
+    parser.add_argument(
+        "--ai-workers", type=int, default=0, help="AI search processes, 0 inline"
+    )
+    parser.add_argument(
+        "--first-frame",
+        action="store_true",
+        help="print when the first frame is on screen and quit",
+    )
+    options = parser.parse_args(argv)
+
+    if options.seed is None:
+        options.seed = new_seed()
+    options.rows, options.cols = options.size
+    if options.preview is None:
+        # the AI looks as far ahead as it is shown
+        options.preview = 2 if options.ai else 0
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+
+    from .app import run
+
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
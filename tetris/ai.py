@@ -0,0 +1,360 @@
+# computer player, beam search over the current shape & the piece preview
+#
+# every level of the search places one more shape of the queue (the current
+# shape, then `game.next_pieces()`), all by straight drops (`movegen.drop_paths`
+# for the current shape, `tucks=True` runs the whole `movegen.search` for it)
+# all children of the beam are scored at once with `tetris.features.evaluate`
+# plus cleared lines, the best `beam_width` go on to the next level. a move is
+# the first placement on the way to the best board of the deepest finished
+# level. the search deepens until the queue ends or the per move `budget` is
+# spent, a level cut short by the budget is dropped, the first level always runs
+# with `workers`, the current shape's placements are split over a process
+# pool, every worker runs its own beam under its share and the move is the
+# best board of the deepest level all of them finished
+#
+# players are tournament policies: `player(game) -> actions`
+#
+# run: python -m tetris.ai --games 10 --pieces 500 --preview 2 --budget 0.005
+#      python -m tetris.tournament tetris.ai:beam_policy --games 100
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+
+from .board import row_heights
+from .engine import DROP
+from .features import evaluate
+from .movegen import MoveGenerator, drop_paths
+from .replay import new_game
+from .rules import DEFAULT_RULES, get_rules
+
+# feature weights of the board a line ends on, and what a cleared line is worth
+WEIGHTS = {"aggregate_height": -0.51, "holes": -0.36, "bumpiness": -0.18}
+LINE_WEIGHT = 0.76
+BEAM_WIDTH = 16
+# seconds per move
+BUDGET = 0.005
+PREVIEW = 2
+# move generator placements cached, current shapes only
+CACHE_SIZE = 1 << 12
+
+
+def lock_rows(rows, heights, rules, shape_type, rotation, x, y):
+    # `row_masks()` style rows & column heights after the shape locks at (x, y)
+    # and full rows clear -> (rows, heights, lines), None when it locks
+    # touching the top row
+    top = rules.grid_row - 1
+    full_row = rules.full_row
+    left = y + rules.shape_bounds[shape_type][rotation][0]
+    rows = list(rows)
+    full = False
+    for dx, mask in rules.shape_masks[shape_type][rotation]:
+        r = x + dx
+        if r >= top:
+            return None
+        rows[r] |= mask << left
+        full = full or rows[r] == full_row
+    # only rows the shape went into can fill up
+    if not full:
+        heights = list(heights)
+        for dy, high in rules.shape_tops[shape_type][rotation]:
+            heights[y + dy] = max(heights[y + dy], x + high + 1)
+        return tuple(rows), heights, 0
+
+    kept = [row for row in rows if row != full_row]
+    lines = len(rows) - len(kept)
+    rows = tuple(kept) + (0,) * lines
+    return rows, row_heights(rows, rules), lines
+
+
+def drop_placements(heights, shape_type, rules):
+    # (rotation, x, y) of every rotation dropped straight down every column
+    placements = []
+    for rotation, (min_dy, max_dy) in enumerate(rules.shape_bounds[shape_type]):
+        columns = rules.shape_columns[shape_type][rotation]
+        for y in range(-min_dy, rules.grid_col - max_dy):
+            x = max(heights[y + dy] - low for dy, low in columns)
+            placements.append((rotation, x, y))
+    return placements
+
+
+def board_scores(children, rules, weights):
+    # children [(rows, heights, reward, root), ...] -> reward + board evaluation each
+    rows = np.fromiter(
+        chain.from_iterable(child[0] for child in children),
+        dtype=np.int64,
+        count=len(children) * rules.grid_row,
+    ).reshape(len(children), rules.grid_row)
+    boards = (rows[:, :, None] & rules.col_bits) != 0
+    rewards = np.array([child[2] for child in children])
+    return rewards + evaluate(boards, weights)
+
+
+def expand(rows, heights, reward, root, shape_type, placements, rules, level):
+    # children of one beam board into `level`, the best reward per board
+    # placements start with (rotation, x, y)
+    for p in placements:
+        locked = lock_rows(rows, heights, rules, shape_type, p[0], p[1], p[2])
+        if locked is None:
+            continue
+        child, child_heights, lines = locked
+        total = reward + LINE_WEIGHT * lines
+        if child not in level or level[child][1] < total:
+            level[child] = (child_heights, total, root)
+
+
+def beam_search(rows, heights, shapes, roots, rules, weights, beam_width, deadline):
+    # `roots` are placements of `shapes[0]` on `rows`, the rest of `shapes`
+    # drop straight -> ([(root index, score) of every finished level], nodes)
+    # `heights` are the column heights of `rows`, children update theirs
+    level = {}
+    for i, p in enumerate(roots):
+        expand(rows, heights, 0.0, i, shapes[0], [p], rules, level)
+    nodes = len(roots)
+    bests = []
+
+    while level:
+        children = [(child, *value) for child, value in level.items()]
+        scoring = time.monotonic()
+        scores = board_scores(children, rules, weights)
+        now = time.monotonic()
+        # what scoring a board takes, a level stops growing once scoring it
+        # and expanding one more board wouldn't fit the deadline
+        per_board = (now - scoring) / len(children)
+        best = int(scores.argmax())
+        bests.append((children[best][3], float(scores[best])))
+        depth = len(bests)
+        if depth == len(shapes) or now >= deadline:
+            break
+
+        if len(children) > beam_width:
+            keep = np.argpartition(-scores, beam_width)[:beam_width]
+            children = [children[i] for i in keep]
+
+        level = {}
+        shape_type = shapes[depth]
+        for child, child_heights, total, root in children:
+            placements = drop_placements(child_heights, shape_type, rules)
+            expand(
+                child, child_heights, total, root, shape_type, placements, rules, level
+            )
+            nodes += len(placements)
+            last, now = now, time.monotonic()
+            if now + (now - last) + per_board * len(level) >= deadline:
+                return bests, nodes
+    return bests, nodes
+
+
+def search_share(size, rows, heights, shapes, roots, weights, beam_width, deadline):
+    # a worker's part of a move, `roots` are (index, placement) of its share
+    rules = get_rules(*size)
+    placements = [p for _, p in roots]
+    bests, nodes = beam_search(
+        rows, heights, shapes, placements, rules, weights, beam_width, deadline
+    )
+    return [(roots[root][0], score) for root, score in bests], nodes
+
+
+class AIPlayer:
+    # plans one placement per shape, `player(game)` returns its keys
+    # workers are spawned, not forked, so they never inherit a GL context
+
+    def __init__(
+        self,
+        rules=None,
+        weights=None,
+        beam_width=BEAM_WIDTH,
+        budget=BUDGET,
+        preview=PREVIEW,
+        workers=0,
+        tucks=False,
+    ):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.weights = weights if weights is not None else WEIGHTS
+        self.beam_width = beam_width
+        self.budget = budget
+        self.preview = preview
+        self.workers = workers
+        self.generator = MoveGenerator(CACHE_SIZE, self.rules) if tucks else None
+
+        self.pool = None
+        if workers:
+            context = multiprocessing.get_context("spawn")
+            self.pool = ProcessPoolExecutor(workers, mp_context=context)
+            # workers start & build their rules before the first move
+            sizes = [self.rules.grid_row] * workers, [self.rules.grid_col] * workers
+            list(self.pool.map(get_rules, *sizes))
+
+        self.moves = 0
+        self.nodes = 0
+        self.seconds = 0.0
+        self.depths = 0
+        self.over_budget = 0
+        self.slowest = 0.0
+
+    def plan(self, game):
+        # -> `Placement` of the current shape, None when every one tops out
+        start = time.monotonic()
+        deadline = start + self.budget
+        rows = game.board.row_masks()
+        # the board keeps its column heights up to date, no rescan per move
+        heights = list(game.board.heights)
+        if self.generator is not None:
+            roots = self.generator.for_game(game)
+        else:
+            position = (game.shape_index, *game.current_pos)
+            roots = drop_paths(
+                rows, game.current_shape_type, position, self.rules, heights
+            )
+        shapes = [game.current_shape_type]
+        shapes += [shape for shape, _ in game.next_pieces(self.preview)]
+
+        if self.pool is None or len(roots) < 2:
+            bests, nodes = beam_search(
+                rows,
+                heights,
+                shapes,
+                roots,
+                self.rules,
+                self.weights,
+                self.beam_width,
+                deadline,
+            )
+            depth = len(bests)
+            root = bests[-1][0] if bests else None
+        else:
+            size = (self.rules.grid_row, self.rules.grid_col)
+            indexed = list(enumerate(roots))
+            shares = [indexed[i :: self.workers] for i in range(self.workers)]
+            futures = [
+                self.pool.submit(
+                    search_share,
+                    size,
+                    rows,
+                    heights,
+                    shapes,
+                    share,
+                    self.weights,
+                    self.beam_width,
+                    deadline,
+                )
+                for share in shares
+                if share
+            ]
+            results = [future.result() for future in futures]
+            nodes = sum(count for _, count in results)
+            # the best board of the deepest level every worker with a board
+            # left finished, scores of different depths don't compare
+            finished = [found for found, _ in results if found]
+            depth = min((len(found) for found in finished), default=0)
+            root = None
+            if finished:
+                level = [found[depth - 1] for found in finished]
+                root = max(level, key=lambda best: best[1])[0]
+
+        elapsed = time.monotonic() - start
+        self.moves += 1
+        self.nodes += nodes
+        self.seconds += elapsed
+        self.depths += depth
+        self.over_budget += elapsed > self.budget
+        self.slowest = max(self.slowest, elapsed)
+        if root is None:
+            return None
+        return roots[root]
+
+    def __call__(self, game):
+        placement = self.plan(game)
+        if placement is None:
+            return []
+        return list(placement.path)
+
+    def stats(self):
+        moves = max(self.moves, 1)
+        return {
+            "moves": self.moves,
+            "nodes": self.nodes,
+            "nodes_per_second": self.nodes / max(self.seconds, 1e-9),
+            "mean_move_ms": self.seconds / moves * 1000,
+            "slowest_move_ms": self.slowest * 1000,
+            "mean_depth": self.depths / moves,
+            "over_budget": self.over_budget,
+        }
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+## in process player for `beam_policy`, one per process
+players = {}
+
+
+def beam_policy(game):
+    # picklable tournament policy with the default settings
+    if game.rules not in players:
+        players[game.rules] = AIPlayer(game.rules)
+    return players[game.rules](game)
+
+
+def play(player, seed, pieces):
+    # one headless game of at most `pieces` shapes -> the engine
+    game = new_game(seed)
+    while not game.is_game_over and game.pieces < pieces:
+        current = game.pieces
+        # a hard drop when every placement tops out
+        for action in player(game) or [DROP]:
+            game.step(action)
+            if game.pieces != current or game.is_game_over:
+                break
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="let the beam search play")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--pieces", type=int, default=500, help="per game at most")
+    parser.add_argument("--seed", type=int, default=0, help="first game's seed")
+    parser.add_argument("--preview", type=int, default=PREVIEW)
+    parser.add_argument("--beam", type=int, default=BEAM_WIDTH)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="s per move")
+    parser.add_argument("--workers", type=int, default=0, help="0 searches inline")
+    args = parser.parse_args()
+
+    player = AIPlayer(
+        beam_width=args.beam,
+        budget=args.budget,
+        preview=args.preview,
+        workers=args.workers,
+    )
+    start = time.perf_counter()
+    pieces = 0
+    for seed in range(args.seed, args.seed + args.games):
+        game = play(player, seed, args.pieces)
+        pieces += game.pieces
+        over = " game over" if game.is_game_over else ""
+        print(
+            f"seed {seed}: score {game.score} lines {game.lines} "
+            f"pieces {game.pieces}{over}"
+        )
+    elapsed = time.perf_counter() - start
+    player.close()
+
+    stats = player.stats()
+    print(
+        f"{pieces} pieces in {elapsed:.1f}s ({pieces / elapsed:,.0f}/s), "
+        f"{stats['moves']} moves, {stats['nodes']} nodes, "
+        f"{stats['nodes_per_second']:,.0f} nodes/s, depth {stats['mean_depth']:.2f}"
+    )
+    print(
+        f"move {stats['mean_move_ms']:.2f} ms mean, {stats['slowest_move_ms']:.2f} ms "
+        f"slowest, {stats['over_budget']} over the {args.budget * 1000:g} ms budget"
+    )
+
+
+if __name__ == "__main__":
+    main()
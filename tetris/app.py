@@ -0,0 +1,338 @@
+# interactive GLUT frontend, started by `python -m tetris` (see `__main__`)
+#
+# the only module of the package importing GLUT and the GL functions it calls
+# by name, nothing else imports it, so the engine, tools and benchmarks load
+# with NumPy alone
+import os
+import random
+import sys
+import time
+from collections import deque
+
+from OpenGL.GL import (
+    GL_COLOR_BUFFER_BIT,
+    GL_MODELVIEW,
+    GL_PROJECTION,
+    GL_RGB,
+    GL_UNSIGNED_BYTE,
+    glClear,
+    glColor3f,
+    glDrawPixels,
+    glLoadIdentity,
+    glMatrixMode,
+    glRasterPos2f,
+    glViewport,
+)
+from OpenGL.GLUT import (
+    GLUT_BITMAP_HELVETICA_10,
+    GLUT_RGB,
+    glutBitmapCharacter,
+    glutCreateWindow,
+    glutDestroyWindow,
+    glutDisplayFunc,
+    glutGetWindow,
+    glutInit,
+    glutInitDisplayMode,
+    glutInitWindowPosition,
+    glutInitWindowSize,
+    glutKeyboardFunc,
+    glutMainLoop,
+    glutPostRedisplay,
+    glutSwapBuffers,
+    glutTimerFunc,
+)
+
+from .engine import DROP, KEY_ACTIONS, TetrisEngine
+from .loop import GameLoop
+from .profiling import Profiler
+from .render import GRID_SIZE, GridRenderer
+from .replay import ReplayRecorder
+from .rules import get_rules
+
+## show log
+SHOW_LOG = 0
+
+
+# for logging and debugging, `message % args` is only formatted when shown
+def log(message, *args):
+    if SHOW_LOG:
+        print(message % args if args else message)
+
+
+class TetrisGame(TetrisEngine):
+    # game logic lives in `TetrisEngine`, `GridRenderer` paints its state into
+    # `self.window` for `fill_buffer()`, `TextureRenderer` draws it with GL
+
+    def __init__(self, renderer, rng=None, rules=None, preview=0):
+        self.renderer = renderer
+        self.window = getattr(renderer, "window", None)
+        super().__init__(rng, rules=rules, preview=preview)
+
+    def generate_new_shape(self):
+        super().generate_new_shape()
+        log("🎲Generated shape: %s", self.current_shape_type)
+
+    def update_filled_grid(self, cells):
+        was_game_over = self.is_game_over
+        super().update_filled_grid(cells)
+
+        if self.is_game_over and not was_game_over:
+            print("🔥🔥🔥🔥🔥🔥🔥🔥🔥Game Over🔥🔥🔥🔥🔥🔥🔥🔥🔥🔥")
+            print("Your Final score:", self.score)
+            print("Enter (space) for restart")
+        elif not self.is_game_over:
+            print("Updated Score:", self.score)
+
+    def update_current_shape(self):
+        # repaints only the cells that changed since last call
+        dirty = self.renderer.render(self)
+        log("🖌repainted %d cells", len(dirty))
+
+
+def make_renderer(options, rules):
+    if options.texture:
+        from .gl_render import TextureRenderer
+
+        return TextureRenderer(GRID_SIZE, rules)
+    return GridRenderer(GRID_SIZE, rules)
+
+
+## set up by `run()`
+options = None
+game = None
+loop = None
+recorder = None
+PROFILER = Profiler()
+# `--ai`: the `tetris.ai.AIPlayer`, keys of its plan left to play and the
+# `game.pieces` they are for
+player = None
+planned = deque()
+planned_for = None
+WINDOW_WIDTH = WINDOW_HEIGHT = 0
+FRAME_MS = 16
+
+
+def keyboard(key, _x, _y):
+    log("(fn) keyboard interrupt key: %r", key)
+    # using useless mouse position
+    _, _ = _x, _y
+
+    avoid_redisplay = False
+
+    if game.is_game_over and key != b" ":
+        print("Enter (space) for restart")
+
+    # map action to key
+    if key == b"q":
+        # Escape key to exit
+        print("Thank for playing with my life 423🙂")
+        print("Your Latest Score", game.score)
+        if player is not None:
+            print_ai_stats()
+            player.close()
+        if options.record:
+            recorder.save(options.record)
+            print("Replay saved to", options.record)
+        glutDestroyWindow(glutGetWindow())
+        avoid_redisplay = True
+    elif player is not None and not game.is_game_over:
+        # the AI has the keys, space still restarts a finished game
+        avoid_redisplay = True
+    elif key in KEY_ACTIONS:
+        # played & drawn by the next frame, key repeat bursts cost one repaint
+        PROFILER.input()
+        loop.push(KEY_ACTIONS[key])
+        avoid_redisplay = True
+
+    if not avoid_redisplay:
+        glutPostRedisplay()
+
+
+def fill_buffer():
+    # takes game.window matrix and draw in one step
+    # only this function apply changes in the screen, rest of the method only
+    # manuplate game.window matrix
+
+    glClear(GL_COLOR_BUFFER_BIT)
+    glRasterPos2f(-1, -1)
+    glDrawPixels(WINDOW_WIDTH, WINDOW_HEIGHT, GL_RGB, GL_UNSIGNED_BYTE, game.window)
+
+
+def overlay_lines():
+    # piece preview, AI stats & profiler percentiles, whichever are on
+    lines = []
+    if game.preview:
+        lines.append("next " + " ".join(shape for shape, _ in game.next_pieces()))
+    if player is not None:
+        stats = player.stats()
+        lines.append(
+            f"ai {stats['mean_move_ms']:.2f} ms/move  depth {stats['mean_depth']:.1f}  "
+            f"{stats['nodes_per_second']:,.0f} nodes/s"
+        )
+    if options.profile:
+        lines += PROFILER.overlay_lines()
+    return lines
+
+
+def draw_overlay(lines):
+    # text lines in the top left corner
+    glColor3f(1, 1, 1)
+    for i, line in enumerate(lines):
+        glRasterPos2f(-0.98, 1 - (i + 1) * 26 / WINDOW_HEIGHT)
+        for char in line:
+            glutBitmapCharacter(GLUT_BITMAP_HELVETICA_10, ord(char))
+
+
+def display():
+    # display all the components
+
+    if game.window is None:
+        game.renderer.draw()
+    else:
+        # grid lines are already part of `game.window`, see `GridRenderer`
+
+        # update the matrix into display
+        fill_buffer()
+
+    lines = overlay_lines()
+    if lines:
+        draw_overlay(lines)
+    glutSwapBuffers()
+    PROFILER.presented()
+
+    if options.first_frame:
+        # startup benchmark, wall clock of the first frame on screen
+        print(f"first frame {time.time():.6f}", flush=True)
+        os._exit(0)
+
+
+def drive():
+    # `--ai`: plans every new shape once, then plays one key of the plan per
+    # frame so the moves show
+    global planned_for
+    if game.is_game_over:
+        planned_for = None
+        return
+    if planned_for != game.pieces:
+        planned_for = game.pieces
+        planned.clear()
+        # a hard drop when every placement tops out
+        planned.extend(player(game) or [DROP])
+    if planned:
+        loop.push(planned.popleft())
+
+
+def print_ai_stats():
+    stats = player.stats()
+    print(
+        f"AI: {stats['moves']} moves, {stats['mean_move_ms']:.2f} ms mean, "
+        f"{stats['slowest_move_ms']:.2f} ms slowest, {stats['over_budget']} over "
+        f"budget, depth {stats['mean_depth']:.2f}, "
+        f"{stats['nodes_per_second']:,.0f} nodes/s"
+    )
+
+
+def update(value):
+    # one frame: queued keys & due gravity ticks, then at most one repaint
+    PROFILER.frame()
+    glutTimerFunc(FRAME_MS, update, 0)
+
+    if player is not None:
+        drive()
+
+    if loop.advance():
+        PROFILER.inputs_played()
+        game.update_current_shape()
+        glutPostRedisplay()
+
+
+def reshape(width, height):
+    # ?? what this does
+    from OpenGL.GLU import gluOrtho2D
+
+    glViewport(0, 0, width, height)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluOrtho2D(0, width, 0, height)
+    glMatrixMode(GL_MODELVIEW)
+
+
+def run(opts):
+    global options, game, loop, recorder, PROFILER, player
+    global WINDOW_WIDTH, WINDOW_HEIGHT, FRAME_MS
+    global keyboard, update, fill_buffer
+
+    options = opts
+    rules = get_rules(options.rows, options.cols)
+    log("GRID ROW X COL = %d X %d", rules.grid_row, rules.grid_col)
+
+    # Window Constants:
+    WINDOW_WIDTH = GRID_SIZE * rules.grid_col
+    WINDOW_HEIGHT = GRID_SIZE * rules.grid_row
+    FRAME_MS = 1000 // options.fps
+
+    # ctrl+c && ctrl+v
+    glutInit(sys.argv)
+    # ctrl+c && ctrl+v
+    glutInitDisplayMode(GLUT_RGB)
+    # ctrl+c && ctrl+v
+    glutInitWindowSize(WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    # this set window position (0,0) means strt from top-left
+    # then oftet determine the exact position of start from top-left
+    glutInitWindowPosition(100, 100)
+
+    # (`opengl` is important for xmonad to ingnore tiling)
+    wind = glutCreateWindow(b"opengl")
+    # wind = glutCreateWindow(b"Tetris")
+
+    # window buffer & game only once there is a window to show them in
+    print("Seed:", options.seed)
+    game = TetrisGame(
+        make_renderer(options, rules),
+        random.Random(options.seed),
+        rules,
+        options.preview,
+    )
+    if options.ai:
+        from .ai import AIPlayer
+
+        player = AIPlayer(
+            rules,
+            budget=options.ai_budget,
+            preview=options.preview,
+            workers=options.ai_workers,
+        )
+
+    # stage timings, nothing is wrapped unless profiling is on
+    PROFILER = Profiler(
+        options.profile or options.profile_dump is not None, options.profile_dump
+    )
+    keyboard = PROFILER.timed("keyboard", keyboard)
+    update = PROFILER.timed("update", update)
+    fill_buffer = PROFILER.timed("fill_buffer", fill_buffer)
+    PROFILER.instrument(game, "update_current_shape", "get_ghost_shape")
+    if player is not None:
+        PROFILER.instrument(player, "plan")
+    # grid lines are baked into the cell blocks once, only the texture
+    # renderer draws per frame
+    PROFILER.instrument(game.renderer, "draw")
+    game.renderer.compose = PROFILER.timed("fill_occupied_grid", game.renderer.compose)
+
+    game.update_current_shape()
+    recorder = ReplayRecorder(options.seed, rules)
+    loop = GameLoop(game, options.gravity, options.speedup, on_step=recorder.record)
+
+    # display maybe, god knows
+    glutDisplayFunc(display)
+
+    # what this does?
+    # glutReshapeFunc(reshape)
+
+    # to handle keyboard control
+    glutKeyboardFunc(keyboard)
+
+    # timer function
+    glutTimerFunc(0, update, 0)
+
+    glutMainLoop()
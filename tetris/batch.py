@@ -0,0 +1,190 @@
+import random
+
+import numpy as np
+
+from .constants import COLORS
+from .engine import DROP, LEFT, RIGHT, ROTATE, ROTATE_CW, TICK
+from .rules import CCW, CW, DEFAULT_RULES
+
+
+class BatchEngine:
+    # steps N independent games at once, same rules as `TetrisEngine`
+    # board `i` with `random.Random(seeds[i])` plays exactly like
+    # `TetrisEngine(random.Random(seeds[i]))` given the same actions
+    #
+    # `colors` holds 1 + index into `COLORS` per filled cell, 0 when empty
+    # shape cells come from `rules.cell_x` / `rules.cell_y`, padded to the
+    # largest piece of the set
+
+    def __init__(self, seeds, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.rngs = [random.Random(seed) for seed in seeds]
+        n = len(self.rngs)
+
+        shape = (n, self.rules.grid_row, self.rules.grid_col)
+        self.boards = np.zeros(shape, dtype=bool)
+        self.colors = np.zeros(shape, dtype=np.uint8)
+
+        self.shape_type = np.zeros(n, dtype=np.intp)
+        self.rotation = np.zeros(n, dtype=np.intp)
+        self.pos_x = np.zeros(n, dtype=np.intp)
+        self.pos_y = np.zeros(n, dtype=np.intp)
+        self.color = np.full(n, -1, dtype=np.intp)
+
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.pieces = np.zeros(n, dtype=np.int64)
+        self.is_game_over = np.zeros(n, dtype=bool)
+
+        self.place_on_grid(np.arange(n))
+
+    def __len__(self):
+        return len(self.rngs)
+
+    def place_on_grid(self, idx):
+        # spawning draws from each board's own generator, same order as
+        # `TetrisEngine.generate_new_shape`
+        shape_count = len(self.rules.shape_names)
+        for i in idx:
+            rng = self.rngs[i]
+            self.shape_type[i] = rng.choice(range(shape_count))
+
+            prev_color = self.color[i]
+            color = rng.choice(range(len(COLORS)))
+            while color == prev_color:
+                color = rng.choice(range(len(COLORS)))
+            self.color[i] = color
+
+        self.rotation[idx] = 0
+        self.pos_x[idx], self.pos_y[idx] = self.rules.spawn_pos
+        self.pieces[idx] += 1
+
+    def get_cells(self, idx, x, y, rotation):
+        types = self.shape_type[idx]
+        rows = x[:, None] + self.rules.cell_x[types, rotation]
+        cols = y[:, None] + self.rules.cell_y[types, rotation]
+        return rows, cols
+
+    def collides(self, idx, x, y, rotation):
+        # same as `GridBoard.collides`, one row per board in `idx`
+        _, grid_row, grid_col = self.boards.shape
+        rows, cols = self.get_cells(idx, x, y, rotation)
+        hit = (rows < 0) | (cols < 0) | (cols >= grid_col)
+        hit |= self.boards[
+            idx[:, None],
+            np.clip(rows, 0, grid_row - 1),
+            np.clip(cols, 0, grid_col - 1),
+        ]
+        return hit.any(axis=1)
+
+    def update_filled_grid(self, idx):
+        # lock current shapes of `idx` boards
+        rows, cols = self.get_cells(
+            idx, self.pos_x[idx], self.pos_y[idx], self.rotation[idx]
+        )
+
+        top = self.rules.grid_row - 1
+        game_over = (rows >= top).any(axis=1)
+        self.is_game_over[idx] |= game_over
+
+        inside = rows <= top
+        boards = np.broadcast_to(idx[:, None], rows.shape)[inside]
+        self.boards[boards, rows[inside], cols[inside]] = True
+        self.colors[boards, rows[inside], cols[inside]] = np.broadcast_to(
+            self.color[idx, None] + 1, rows.shape
+        )[inside]
+
+        idx = idx[~game_over]
+        self.update_score(idx)
+        self.place_on_grid(idx)
+
+    def update_score(self, idx):
+        full = self.boards[idx].all(axis=2)
+        cleared = full.sum(axis=1)
+        if not cleared.any():
+            return
+
+        # stable sort moves full rows to the top keeping the rest in order,
+        # then the top `cleared` rows of each board are emptied
+        order = np.argsort(full, axis=1, kind="stable")
+        self.boards[idx] = np.take_along_axis(self.boards[idx], order[:, :, None], 1)
+        self.colors[idx] = np.take_along_axis(self.colors[idx], order[:, :, None], 1)
+
+        grid_row = self.rules.grid_row
+        empty = np.arange(grid_row) >= (grid_row - cleared)[:, None]
+        boards, rows = np.nonzero(empty)
+        self.boards[idx[boards], rows] = False
+        self.colors[idx[boards], rows] = 0
+
+        self.score[idx] += cleared * self.rules.grid_col
+        self.lines[idx] += cleared
+
+    def move_auto_down(self, idx):
+        x, y, rotation = self.pos_x[idx], self.pos_y[idx], self.rotation[idx]
+        hit = self.collides(idx, x - 1, y, rotation)
+        self.pos_x[idx[~hit]] -= 1
+        self.update_filled_grid(idx[hit])
+
+    def move_side(self, idx, step):
+        x, y, rotation = self.pos_x[idx], self.pos_y[idx], self.rotation[idx]
+        hit = self.collides(idx, x, y + step, rotation)
+        self.pos_y[idx[~hit]] += step
+
+    def move_bottom(self, idx):
+        x, y, rotation = self.pos_x[idx], self.pos_y[idx], self.rotation[idx]
+        while True:
+            down = ~self.collides(idx, x - 1, y, rotation)
+            if not down.any():
+                break
+            x[down] -= 1
+
+        self.pos_x[idx] = x
+        self.update_filled_grid(idx)
+
+    def change_shape(self, idx, direction=CCW):
+        # next rotation in `direction` at the first kick offset that fits,
+        # like `TetrisEngine.change_shape`
+        types = self.shape_type[idx]
+        x, y = self.pos_x[idx], self.pos_y[idx]
+        turned = self.rules.turn_table[direction, types, self.rotation[idx]]
+        lowest = self.rules.cell_x[types, turned].min(axis=1)
+        pending = np.ones(len(idx), dtype=bool)
+
+        for k in range(self.rules.kick_x.shape[1]):
+            try_idx = np.flatnonzero(pending & (k < self.rules.kick_counts[types]))
+            if not len(try_idx):
+                break
+
+            boards = idx[try_idx]
+            kick_x = x[try_idx] + self.rules.kick_x[types[try_idx], k]
+            kick_y = y[try_idx] + self.rules.kick_y[types[try_idx], k]
+            # can't rotate into the bottom row
+            fits = lowest[try_idx] + kick_x > 0
+            fits &= ~self.collides(boards, kick_x, kick_y, turned[try_idx])
+
+            self.rotation[boards[fits]] = turned[try_idx[fits]]
+            self.pos_x[boards[fits]] = kick_x[fits]
+            self.pos_y[boards[fits]] = kick_y[fits]
+            pending[try_idx[fits]] = False
+
+    def game_restart(self, idx):
+        self.boards[idx] = False
+        self.colors[idx] = 0
+        self.is_game_over[idx] = False
+        self.score[idx] = 0
+        self.lines[idx] = 0
+        self.pieces[idx] = 0
+        self.place_on_grid(idx)
+
+    def step(self, actions):
+        # one action per board, see `TetrisEngine.step`
+        actions = np.asarray(actions)
+        over = self.is_game_over.copy()
+
+        self.move_auto_down(np.flatnonzero((actions == TICK) & ~over))
+        self.move_side(np.flatnonzero((actions == LEFT) & ~over), -1)
+        self.move_side(np.flatnonzero((actions == RIGHT) & ~over), 1)
+        self.move_bottom(np.flatnonzero((actions == DROP) & ~over))
+        self.change_shape(np.flatnonzero((actions == ROTATE) & ~over), CCW)
+        self.change_shape(np.flatnonzero((actions == ROTATE_CW) & ~over), CW)
+        self.game_restart(np.flatnonzero((actions == ROTATE) & over))
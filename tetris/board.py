@@ -0,0 +1,212 @@
+import numpy as np
+
+from .constants import PALETTE
+from .rules import DEFAULT_RULES
+
+# rgb of every palette index, for `filled_grid`
+PALETTE_RGB = np.array(PALETTE, dtype=np.float64)
+
+
+def read_only(array):
+    # derived grids are rebuilt on every access, writes to them would be lost
+    array.flags.writeable = False
+    return array
+
+
+def row_heights(rows, rules):
+    # column heights of `row_masks()` style rows, walking rows from the top,
+    # a column's height is its first set bit
+    heights = [0] * rules.grid_col
+    left = rules.full_row
+    for x in range(len(rows) - 1, -1, -1):
+        found = rows[x] & left
+        while found:
+            bit = found & -found
+            heights[bit.bit_length() - 1] = x + 1
+            found ^= bit
+        left &= ~rows[x]
+        if not left:
+            break
+    return heights
+
+
+class GridBoard:
+    # board backed by numpy `cells`, one uint8 `PALETTE` index per cell
+    #
+    # both boards share the same api:
+    #   rules -> `tetris.rules.Rules`, board size & shape tables
+    #   cells -> (grid_row, grid_col) uint8, 0 empty, else `PALETTE` index
+    #   bool_grid, filled_grid -> derived read only copies, filled & rgb per
+    #       cell, edit `cells` instead
+    #   collides(shape_type, index, x, y) -> shape at (x, y) overlaps the
+    #       floor, the walls or a filled cell (cells above the grid are checked
+    #       against the top row)
+    #   lock(cells, color) -> fill cells inside the grid with palette `color`
+    #   clear_lines() -> remove full rows, returns their indices
+    #   row_masks() -> tuple of `BitBoard` style row ints, bottom row first
+    #   drop_row(shape_type, index, x, y) -> `rules.landing_row` on
+    #       `self.heights`
+    #   update_cells() -> recount derived state after editing `cells` directly
+    #   reset()
+    #   hash -> zobrist hash of filled cells, see `tetris.hashing`
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.keys = self.rules.keys
+        self.cells = np.zeros((self.rules.grid_row, self.rules.grid_col), np.uint8)
+        # filled height of every column, kept up to date on lock & clear
+        self.heights = [0] * self.rules.grid_col
+        self.hash = 0
+
+    @property
+    def bool_grid(self):
+        return read_only(self.cells != 0)
+
+    @property
+    def filled_grid(self):
+        return read_only(PALETTE_RGB[self.cells])
+
+    def collides(self, shape_type, index, x, y):
+        grid_row, grid_col = self.cells.shape
+        for dx, dy in self.rules.shapes[shape_type][index]:
+            r, c = x + dx, y + dy
+            if r < 0 or c < 0 or c >= grid_col:
+                return True
+            if self.cells[min(r, grid_row - 1), c]:
+                return True
+        return False
+
+    def lock(self, cells, color):
+        top = self.rules.grid_row - 1
+        for x, y in cells:
+            if x <= top:
+                self.cells[x, y] = color
+                self.heights[y] = max(self.heights[y], x + 1)
+                self.hash ^= self.keys.cells[x][y]
+
+    def clear_lines(self):
+        # drop every full row at once, rows above them move down in order
+        full = self.cells.all(axis=1)
+        if not full.any():
+            return []
+
+        cleared = np.flatnonzero(full).tolist()
+        # only rows from the lowest cleared one up change
+        start = cleared[0]
+        self.hash ^= self.keys.board_hash(self.row_masks(), start)
+
+        keep = ~full
+        count = int(keep.sum())
+        self.cells[:count] = self.cells[keep]
+        self.cells[count:] = 0
+
+        self.hash ^= self.keys.board_hash(self.row_masks(), start)
+        self.update_heights()
+        return cleared
+
+    def row_masks(self):
+        return tuple((self.cells != 0).dot(self.rules.col_bits).tolist())
+
+    def drop_row(self, shape_type, index, x, y):
+        return self.rules.landing_row(self.heights, shape_type, index, x, y)
+
+    def update_cells(self):
+        self.hash = self.keys.board_hash(self.row_masks())
+        self.update_heights()
+
+    def update_heights(self):
+        filled = self.cells != 0
+        top = len(filled) - filled[::-1].argmax(axis=0)
+        self.heights = np.where(filled.any(axis=0), top, 0).tolist()
+
+    def reset(self):
+        self.cells[:] = 0
+        self.heights = [0] * self.rules.grid_col
+        self.hash = 0
+
+
+class BitBoard:
+    # board backed by one `grid_col` bit int per row, so collision is a few
+    # ANDs against the precomputed `rules.shape_masks` and a full row is
+    # `rules.full_row`, `cells` keeps the colors for renderers
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.keys = self.rules.keys
+        self.rows = [0] * self.rules.grid_row
+        self.cells = np.zeros((self.rules.grid_row, self.rules.grid_col), np.uint8)
+        self.heights = [0] * self.rules.grid_col
+        self.hash = 0
+
+    @property
+    def bool_grid(self):
+        rows = np.array(self.rows, dtype=np.uint64)[:, None]
+        bits = rows >> np.arange(self.rules.grid_col, dtype=np.uint64)
+        return read_only((bits & 1).astype(bool))
+
+    @property
+    def filled_grid(self):
+        return read_only(PALETTE_RGB[self.cells])
+
+    def collides(self, shape_type, index, x, y):
+        rules = self.rules
+        min_dy, max_dy = rules.shape_bounds[shape_type][index]
+        left = y + min_dy
+        if left < 0 or y + max_dy >= rules.grid_col:
+            return True
+
+        rows = self.rows
+        top = rules.grid_row - 1
+        for dx, mask in rules.shape_masks[shape_type][index]:
+            r = x + dx
+            if r < 0:
+                return True
+            if rows[r if r < top else top] & (mask << left):
+                return True
+        return False
+
+    def lock(self, cells, color):
+        top = self.rules.grid_row - 1
+        for x, y in cells:
+            if x <= top:
+                self.cells[x, y] = color
+                self.rows[x] |= 1 << y
+                self.heights[y] = max(self.heights[y], x + 1)
+                self.hash ^= self.keys.cells[x][y]
+
+    def clear_lines(self):
+        full_row = self.rules.full_row
+        cleared = [i for i, row in enumerate(self.rows) if row == full_row]
+        if not cleared:
+            return cleared
+
+        start = cleared[0]
+        self.hash ^= self.keys.board_hash(self.rows, start)
+
+        keep = [i for i, row in enumerate(self.rows) if row != full_row]
+        self.rows = [self.rows[i] for i in keep] + [0] * len(cleared)
+        self.hash ^= self.keys.board_hash(self.rows, start)
+        self.cells[: len(keep)] = self.cells[keep]
+        self.cells[len(keep) :] = 0
+        self.update_heights()
+        return cleared
+
+    def row_masks(self):
+        return tuple(self.rows)
+
+    def drop_row(self, shape_type, index, x, y):
+        return self.rules.landing_row(self.heights, shape_type, index, x, y)
+
+    def update_cells(self):
+        self.rows = (self.cells != 0).dot(self.rules.col_bits).tolist()
+        self.hash = self.keys.board_hash(self.rows)
+        self.update_heights()
+
+    def update_heights(self):
+        self.heights = row_heights(self.rows, self.rules)
+
+    def reset(self):
+        self.rows = [0] * self.rules.grid_row
+        self.cells[:] = 0
+        self.heights = [0] * self.rules.grid_col
+        self.hash = 0
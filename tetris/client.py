@@ -0,0 +1,193 @@
+# client side of `tetris.server`, and a load generator built on it
+#
+# `GameClient` keeps a local copy of the board from the server's updates,
+# `LoadClient` presses random keys at a fixed rate and times every key until
+# the update acking it arrives
+#
+# run: python -m tetris.client --sessions 1000 --rate 2 --duration 10
+#      python -m tetris.client --unix /tmp/tetris.sock --sessions 100
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from .server import GAME_OVER, HELLO, HOST, PORT, decode_frames
+
+# keys of the load generator, mostly moves like a player
+LOAD_KEYS = b"hhhllljj  "
+# connections opened at once, stays under the server's listen backlog
+CONNECT_BATCH = 100
+PERCENTILES = (50, 90, 99)
+
+
+class GameClient(asyncio.Protocol):
+    # `cells` is (rows, cols) `PALETTE` indices, row 0 at the bottom, like
+    # `TetrisEngine.cells` with the falling shape painted in
+
+    def __init__(self):
+        self.transport = None
+        self.buffer = bytearray()
+        self.seed = None
+        self.cells = None
+        self.ack = 0
+        self.score = 0
+        self.is_game_over = False
+        self.updates = 0
+        # resolved by the server's HELLO
+        self.ready = asyncio.get_running_loop().create_future()
+        self.closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+    def data_received(self, data):
+        self.buffer += data
+        frames, used = decode_frames(self.buffer)
+        del self.buffer[:used]
+        for frame in frames:
+            if frame[0] == HELLO:
+                _, rows, cols, self.seed = frame
+                self.cells = np.zeros((rows, cols), dtype=np.uint8)
+                self.ready.set_result(self)
+            else:
+                self.apply(*frame[1:])
+
+    def apply(self, ack, score, flags, changes):
+        flat = self.cells.reshape(-1)
+        for cell, color in changes:
+            flat[cell] = color
+        self.ack = ack
+        self.score = score
+        self.is_game_over = bool(flags & GAME_OVER)
+        self.updates += 1
+        self.on_update()
+
+    def on_update(self):
+        pass
+
+    def press(self, keys):
+        # key bytes, `b"h"`, `b"hhj"`, ... `b"q"` quits
+        self.transport.write(keys)
+
+
+class LoadClient(GameClient):
+    # sends a key every `1 / rate` seconds (randomly phased) until `stop()`
+
+    def __init__(self, rate, latencies, rng):
+        super().__init__()
+        self.interval = 1 / rate
+        self.latencies = latencies
+        self.rng = rng
+        self.loop = asyncio.get_running_loop()
+        # (key number, send time) of keys the server didn't ack yet
+        self.pending = deque()
+        self.sent = 0
+        self.timer = None
+
+    def start(self):
+        self.timer = self.loop.call_later(
+            self.rng.uniform(0, self.interval), self.on_timer
+        )
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def on_timer(self):
+        self.sent += 1
+        self.pending.append((self.sent, self.loop.time()))
+        self.press(bytes((self.rng.choice(LOAD_KEYS),)))
+        self.timer = self.loop.call_later(self.interval, self.on_timer)
+
+    def on_update(self):
+        now = self.loop.time()
+        while self.pending and self.pending[0][0] <= self.ack:
+            self.latencies.append(now - self.pending.popleft()[1])
+
+
+async def connect(factory, host=HOST, port=PORT, path=None):
+    loop = asyncio.get_running_loop()
+    if path is not None:
+        _, client = await loop.create_unix_connection(factory, path)
+    else:
+        _, client = await loop.create_connection(factory, host, port)
+    return await client.ready
+
+
+async def run_load(sessions, rate, duration, host=HOST, port=PORT, path=None, seed=0):
+    # -> stats of `sessions` clients pressing `rate` keys/s for `duration` s
+    rng = random.Random(seed)
+    latencies = []
+    clients = []
+    for first in range(0, sessions, CONNECT_BATCH):
+        count = min(CONNECT_BATCH, sessions - first)
+        clients += await asyncio.gather(
+            *(
+                connect(lambda: LoadClient(rate, latencies, rng), host, port, path)
+                for _ in range(count)
+            )
+        )
+
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    await asyncio.sleep(duration)
+    for client in clients:
+        client.stop()
+    # lets the last updates arrive
+    await asyncio.sleep(0.2)
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        client.press(b"q")
+    await asyncio.gather(*(client.closed for client in clients))
+
+    latencies = np.array(latencies) * 1000
+    keys = sum(client.sent for client in clients)
+    stats = {
+        "sessions": sessions,
+        "keys": keys,
+        "keys_per_second": keys / elapsed,
+        "updates": sum(client.updates for client in clients),
+        "unanswered": sum(len(client.pending) for client in clients),
+    }
+    for p in PERCENTILES:
+        value = np.percentile(latencies, p) if len(latencies) else float("nan")
+        stats[f"p{p}_ms"] = float(value)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load a tetris server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="unix socket path instead of tcp")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=2.0, help="keys/s per session")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    args = parser.parse_args()
+
+    stats = asyncio.run(
+        run_load(
+            args.sessions, args.rate, args.duration, args.host, args.port, args.unix
+        )
+    )
+    latency = "  ".join(f"p{p} {stats[f'p{p}_ms']:.2f} ms" for p in PERCENTILES)
+    print(
+        f"{stats['sessions']} sessions, {stats['keys']} keys, "
+        f"{stats['keys_per_second']:,.0f} keys/s, {stats['updates']} updates, "
+        f"{stats['unanswered']} unanswered"
+    )
+    print(f"key to update  {latency}")
+
+
+if __name__ == "__main__":
+    main()
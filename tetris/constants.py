@@ -0,0 +1,56 @@
+## grid rows & columns
+GRID_ROW = 20
+GRID_COL = 10
+
+## board cells hold an index into `PALETTE`, 0 is empty, `i + 1` is `COLORS[i]`
+GRID_EMPTY_CELL = (0.03627, 0.08627, 0.031373)
+
+COLORS = [
+    (1.0, 0.0, 0.0),  # red
+    (0.0, 0.0, 1.0),  # blue
+    (0.0, 1.0, 0.0),  # green
+    (1.0, 1.0, 0.0),  # yellow
+    (1.0, 0.0, 1.0),  # magenta
+]
+
+PALETTE = [GRID_EMPTY_CELL] + COLORS
+COLOR_INDEX = {color: i for i, color in enumerate(PALETTE) if i}
+
+# (row, col) offsets from `current_pos`, row 0 is the bottom of the grid
+SHAPES = {
+    "O": [
+        [(0, 0), (1, 0), (0, 1), (1, 1)],
+    ],
+    "T": [
+        [(0, 1), (1, 1), (1, 2), (2, 1)],
+        [(1, 0), (1, 1), (1, 2), (2, 1)],
+        [(0, 1), (1, 0), (1, 1), (2, 1)],
+        [(0, 1), (1, 0), (1, 1), (1, 2)],
+    ],
+    "J": [
+        [(2, 1), (1, 1), (0, 1), (0, 0)],
+        [(1, 0), (1, 1), (1, 2), (0, 2)],
+        [(0, 1), (1, 1), (2, 1), (2, 2)],
+        [(1, 0), (1, 1), (1, 2), (2, 0)],
+    ],
+    "Z": [
+        [(0, 0), (1, 0), (1, 1), (2, 1)],
+        [(0, 1), (0, 2), (1, 0), (1, 1)],
+    ],
+    "S": [
+        [(2, 0), (1, 0), (1, 1), (0, 1)],
+        [(0, 0), (0, 1), (1, 1), (1, 2)],
+    ],
+    "L": [
+        [(1, 0), (1, 1), (1, 2), (2, 2)],
+        [(0, 1), (1, 1), (2, 1), (2, 0)],
+        [(0, 0), (1, 0), (1, 1), (1, 2)],
+        [(0, 1), (0, 2), (1, 1), (2, 1)],
+    ],
+    "I": [
+        [(0, 1), (1, 1), (2, 1), (3, 1)],
+        [(1, 0), (1, 1), (1, 2), (1, 3)],
+    ],
+}
+
+SHAPE_NAMES = list(SHAPES.keys())
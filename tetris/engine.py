@@ -0,0 +1,247 @@
+import random
+
+from .board import GridBoard
+from .constants import COLOR_INDEX, COLORS
+from .rules import CCW, CW, DEFAULT_RULES
+
+## actions, `TICK` is the gravity timer, rest are the keys `keyboard()` handles
+## `ROTATE` turns counter-clockwise, `ROTATE_CW` clockwise
+TICK, LEFT, RIGHT, DROP, ROTATE, ROTATE_CW = range(6)
+KEY_ACTIONS = {b"h": LEFT, b"l": RIGHT, b"j": DROP, b" ": ROTATE, b"k": ROTATE_CW}
+
+
+def draw_piece(rng, shape_names, prev_color):
+    # next (shape type, color) from `rng`, never the same color twice in a row
+    shape_type = rng.choice(shape_names)
+    color = rng.choice(COLORS)
+    while color == prev_color:
+        color = rng.choice(COLORS)
+    return shape_type, color
+
+
+class TetrisEngine:
+    # game rules & board state only, no OpenGL and no pixel buffer
+    # renderers read `cells` & current shape after each step
+
+    def __init__(self, rng=None, board=None, rules=None, preview=0):
+        # per game generator, so games don't share the global `random` state
+        self.rng = rng if rng is not None else random.Random()
+        # board size & shapes, shared with the board, see `tetris.rules`
+        if rules is None:
+            rules = board.rules if board is not None else DEFAULT_RULES
+        self.rules = rules
+        # `GridBoard` or `BitBoard`, see `tetris.board`
+        self.board = board if board is not None else GridBoard(rules)
+        if self.board.rules is not rules:
+            raise ValueError(f"board plays {self.board.rules}, not {rules}")
+
+        self.is_game_over = False
+        self.score = 0
+        self.lines = 0
+        self.pieces = 0
+        # rows removed by the last lock, bottom first, as they were numbered
+        # before clearing
+        self.cleared_rows = []
+
+        # how many upcoming pieces `next_pieces()` shows by default
+        self.preview = preview
+        # upcoming pieces already drawn, from `lookahead`, a copy of `rng`
+        self.upcoming = []
+        self.lookahead = None
+
+        self.current_color = None
+        self.place_on_grid()
+
+    def generate_new_shape(self):
+        self.current_shape_type, self.current_color = draw_piece(
+            self.rng, self.rules.shape_names, self.current_color
+        )
+        # same draws as the lookahead made, the rest of the queue stays valid,
+        # a spawn nobody previewed leaves the lookahead behind `rng`
+        if self.upcoming:
+            self.upcoming.pop(0)
+        else:
+            self.lookahead = None
+
+        self.shape_index = 0
+        self.current_shape = self.rules.shapes[self.current_shape_type][0]
+
+    def next_pieces(self, count=None):
+        # the next `count` (shape type, color) pairs to spawn, `preview` by
+        # default, drawn ahead on a copy of `rng`, so the game's own draws (and
+        # its replays & snapshots) are the same with or without a preview
+        count = self.preview if count is None else count
+        if len(self.upcoming) < count:
+            if self.lookahead is None:
+                self.lookahead = random.Random()
+                self.lookahead.setstate(self.rng.getstate())
+            prev_color = self.upcoming[-1][1] if self.upcoming else self.current_color
+            while len(self.upcoming) < count:
+                piece = draw_piece(self.lookahead, self.rules.shape_names, prev_color)
+                self.upcoming.append(piece)
+                prev_color = piece[1]
+        return self.upcoming[:count]
+
+    def clear_queue(self):
+        # after replacing `rng` or its state
+        self.upcoming = []
+        self.lookahead = None
+
+    def place_on_grid(self):
+        # new shape starts just above the grid
+        self.generate_new_shape()
+        self.current_pos = self.rules.spawn_pos
+        self.pieces += 1
+
+    @property
+    def cells(self):
+        return self.board.cells
+
+    @property
+    def bool_grid(self):
+        return self.board.bool_grid
+
+    @property
+    def filled_grid(self):
+        return self.board.filled_grid
+
+    def state_hash(self):
+        # board occupancy plus current shape & rotation
+        piece_keys = self.rules.keys.pieces[self.current_shape_type]
+        return self.board.hash ^ piece_keys[self.shape_index]
+
+    def get_cells(self, shape=None, pos=None):
+        shape = self.current_shape if shape is None else shape
+        x, y = self.current_pos if pos is None else pos
+        return [(dx + x, dy + y) for dx, dy in shape]
+
+    def collides(self, x, y, index=None):
+        index = self.shape_index if index is None else index
+        return self.board.collides(self.current_shape_type, index, x, y)
+
+    def detect_bottom_collision(self, pos=None):
+        x, y = self.current_pos if pos is None else pos
+        return self.collides(x - 1, y)
+
+    def detect_left_collision(self):
+        x, y = self.current_pos
+        return self.collides(x, y - 1)
+
+    def detect_right_collision(self):
+        x, y = self.current_pos
+        return self.collides(x, y + 1)
+
+    def detect_rotation_collission(self, index, pos=None):
+        # can't rotate into the bottom row
+        x, y = self.current_pos if pos is None else pos
+        if self.rules.shape_lowest[self.current_shape_type][index] + x <= 0:
+            return True
+        return self.collides(x, y, index)
+
+    def get_drop_pos(self):
+        # straight from the column heights, walking down only when the shape
+        # is tucked under an overhang
+        x, y = self.current_pos
+        land = self.board.drop_row(self.current_shape_type, self.shape_index, x, y)
+        if land is not None:
+            return land, y
+
+        while not self.detect_bottom_collision((x, y)):
+            x -= 1
+        return x, y
+
+    def get_ghost_shape(self):
+        return self.get_cells(pos=self.get_drop_pos())
+
+    def change_shape(self, direction=CCW):
+        # next rotation in `direction` at the first kick offset that fits,
+        # otherwise stay as is, see `Rules.rotation_tests`
+        shape_type = self.current_shape_type
+        tests = self.rules.rotation_tests[shape_type][direction][self.shape_index]
+        x, y = self.current_pos
+        for index, dx, dy, lowest in tests:
+            # can't rotate into the bottom row
+            if lowest + x + dx > 0 and not self.collides(x + dx, y + dy, index):
+                self.shape_index = index
+                self.current_shape = self.rules.shapes[shape_type][index]
+                self.current_pos = (x + dx, y + dy)
+                return True
+        return False
+
+    def detect_game_over(self, cells):
+        # shape locked while touching the top row
+        top = self.rules.grid_row - 1
+        if any(x >= top for x, _ in cells):
+            self.is_game_over = True
+        return self.is_game_over
+
+    def update_filled_grid(self, cells):
+        self.cleared_rows = []
+        game_over = self.detect_game_over(cells)
+        self.board.lock(cells, COLOR_INDEX[self.current_color])
+        if game_over:
+            return
+
+        self.update_score()
+        self.place_on_grid()
+
+    def update_score(self):
+        self.cleared_rows = self.board.clear_lines()
+        self.score += len(self.cleared_rows) * self.rules.grid_col
+        self.lines += len(self.cleared_rows)
+
+    def move_auto_down(self):
+        if self.is_game_over:
+            return
+
+        if self.detect_bottom_collision():
+            self.update_filled_grid(self.get_cells())
+            return
+
+        self.current_pos = (self.current_pos[0] - 1, self.current_pos[1])
+
+    def move_left(self):
+        if self.is_game_over or self.detect_left_collision():
+            return False
+        self.current_pos = (self.current_pos[0], self.current_pos[1] - 1)
+        return True
+
+    def move_right(self):
+        if self.is_game_over or self.detect_right_collision():
+            return False
+        self.current_pos = (self.current_pos[0], self.current_pos[1] + 1)
+        return True
+
+    def move_bottom(self):
+        if self.is_game_over:
+            return
+        self.current_pos = self.get_drop_pos()
+        self.update_filled_grid(self.get_cells())
+
+    def game_restart(self):
+        self.board.reset()
+        self.is_game_over = False
+        self.score = 0
+        self.lines = 0
+        self.pieces = 0
+        self.cleared_rows = []
+        self.place_on_grid()
+
+    def step(self, action):
+        if action == TICK:
+            self.move_auto_down()
+        elif action == LEFT:
+            self.move_left()
+        elif action == RIGHT:
+            self.move_right()
+        elif action == DROP:
+            self.move_bottom()
+        elif action == ROTATE:
+            # space restarts a finished game
+            if self.is_game_over:
+                self.game_restart()
+            else:
+                self.change_shape(CCW)
+        elif action == ROTATE_CW:
+            if not self.is_game_over:
+                self.change_shape(CW)
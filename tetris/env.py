@@ -0,0 +1,291 @@
+# reinforcement learning environments, gym style `reset()` / `step(action)`
+#
+# `TetrisEnv` is one game, `step` plays one engine action (`TICK`, `LEFT`,
+# `RIGHT`, `DROP`, `ROTATE`, `ROTATE_CW`) and returns (obs, reward, done,
+# info). the reward is the score `update_score` adds for the lines the action
+# cleared, observations are (rows, cols) uint8, `OBS_EMPTY`, `OBS_FILLED` for
+# locked cells & `OBS_SHAPE` for the falling shape, row 0 at the bottom
+#
+# `VectorEnv` steps many games in worker processes. observations, actions,
+# rewards, dones & scores of all games live in one shared memory block laid
+# out by `shared_dtype`, workers write straight into it and the pipes only
+# carry one byte commands, so a batch reaches the learner without a copy or
+# any pickling. finished games reset on their own, `dones` says which did
+# the block is unlinked on `close()`, at the end of a `with` block or when the
+# env is garbage collected, a worker that died makes the next call raise
+#
+# run: python -m benchmarks.bench_env
+import multiprocessing
+import os
+import random
+import weakref
+from functools import lru_cache
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .board import BitBoard
+from .engine import TetrisEngine
+from .rules import DEFAULT_RULES, get_rules
+
+OBS_EMPTY, OBS_FILLED, OBS_SHAPE = range(3)
+# actions are engine actions, `TICK` .. `ROTATE_CW`
+ACTION_COUNT = 6
+
+## worker commands, a worker answers every one with an empty message
+STEP, RESET, CLOSE = b"s", b"r", b"c"
+
+
+class TetrisEnv:
+    # one game on a `BitBoard`, observations go to `out` (a fresh array when
+    # None), `step` returns the same array every time, copy it to keep it
+    # the first `reset()` starts from `seed`, later ones play on with the same
+    # generator unless given a new seed
+
+    def __init__(self, seed=None, rules=None, out=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.seed = seed
+        self.game = TetrisEngine(random.Random(seed), BitBoard(self.rules))
+        shape = (self.rules.grid_row, self.rules.grid_col)
+        self.obs = out if out is not None else np.zeros(shape, dtype=np.uint8)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed, self.seed = self.seed, None
+        game = self.game
+        if seed is not None:
+            # the same shapes & colors as `new_game(seed)`
+            game.rng.seed(seed)
+            game.current_color = None
+            game.clear_queue()
+        game.game_restart()
+        return self.observe()
+
+    def step(self, action):
+        game = self.game
+        if game.is_game_over:
+            raise RuntimeError("step() on a finished game, reset() it first")
+        score = game.score
+        game.step(action)
+        info = {"score": game.score, "lines": game.lines, "pieces": game.pieces}
+        return self.observe(), float(game.score - score), game.is_game_over, info
+
+    def observe(self):
+        obs = self.obs
+        np.not_equal(self.game.cells, 0, out=obs, casting="unsafe")
+        if not self.game.is_game_over:
+            top = self.rules.grid_row
+            for x, y in self.game.get_cells():
+                if x < top:
+                    obs[x, y] = OBS_SHAPE
+        return obs
+
+
+@lru_cache(maxsize=None)
+def shared_dtype(count, rules=DEFAULT_RULES):
+    # one record holding every array of `count` games, each field contiguous
+    return np.dtype(
+        [
+            ("obs", np.uint8, (count, rules.grid_row, rules.grid_col)),
+            ("actions", np.uint8, (count,)),
+            ("rewards", np.float32, (count,)),
+            ("dones", np.bool_, (count,)),
+            # score of the game as the step left it, the final score when done
+            ("scores", np.int64, (count,)),
+        ],
+        align=True,
+    )
+
+
+def step_envs(envs, block, first):
+    # plays `actions` on games first.. of `block`, resets the finished ones
+    actions, rewards = block["actions"], block["rewards"]
+    dones, scores = block["dones"], block["scores"]
+    for i, env in enumerate(envs, first):
+        _, rewards[i], dones[i], info = env.step(actions[i])
+        scores[i] = info["score"]
+        if dones[i]:
+            env.reset()
+
+
+def reset_envs(envs, block, first):
+    for i, env in enumerate(envs, first):
+        env.reset()
+        block["rewards"][i] = 0
+        block["dones"][i] = False
+        block["scores"][i] = 0
+
+
+def run_worker(name, count, size, first, seeds, conn):
+    # worker process, games first.. first + len(seeds) of the shared block
+    memory = SharedMemory(name)
+    rules = get_rules(*size)
+    block = np.ndarray((), dtype=shared_dtype(count, rules), buffer=memory.buf)
+    obs = block["obs"]
+    envs = [
+        TetrisEnv(seed, rules, out=obs[i]) for i, seed in enumerate(seeds, first)
+    ]
+    while True:
+        command = conn.recv_bytes()
+        if command == STEP:
+            step_envs(envs, block, first)
+        elif command == RESET:
+            reset_envs(envs, block, first)
+        else:
+            break
+        conn.send_bytes(b"")
+
+    # views into the block have to go before it closes
+    del envs, obs, block
+    memory.close()
+    conn.send_bytes(b"")
+
+
+def worker_died(process):
+    # the error for a worker that stopped answering, once it's reaped
+    process.join(1)
+    return RuntimeError(f"env worker {process.pid} exited with {process.exitcode}")
+
+
+def release_block(memory, processes):
+    # last resort when a `VectorEnv` goes without `close()`, views of the
+    # block the caller still holds keep the mapping, the name goes anyway
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    try:
+        memory.close()
+    except BufferError:
+        pass
+    memory.unlink()
+
+
+class VectorEnv:
+    # `len(seeds)` games split over `workers` spawned processes (one per cpu
+    # by default), `workers=0` steps them inline, same arrays, no processes
+    # `obs`, `rewards`, `dones` & `scores` are views into the shared block,
+    # every step overwrites them
+
+    def __init__(self, seeds, workers=None, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        count = len(seeds)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, count)
+        dtype = shared_dtype(count, self.rules)
+
+        self.memory = None
+        self.envs = []
+        self.conns = []
+        self.processes = []
+        if workers:
+            self.memory = SharedMemory(create=True, size=dtype.itemsize)
+            # holds the memory & processes, not the env, so it can run once
+            # nothing refers to the env anymore
+            self.release = weakref.finalize(
+                self, release_block, self.memory, self.processes
+            )
+            buffer = self.memory.buf
+        else:
+            buffer = bytearray(dtype.itemsize)
+        self.block = np.ndarray((), dtype=dtype, buffer=buffer)
+        self.obs = self.block["obs"]
+        self.actions = self.block["actions"]
+        self.rewards = self.block["rewards"]
+        self.dones = self.block["dones"]
+        self.scores = self.block["scores"]
+
+        if not workers:
+            self.envs = [
+                TetrisEnv(seed, self.rules, out=self.obs[i])
+                for i, seed in enumerate(seeds)
+            ]
+            return
+
+        # spawned, not forked, so workers never inherit a GL context
+        context = multiprocessing.get_context("spawn")
+        size = (self.rules.grid_row, self.rules.grid_col)
+        bounds = np.linspace(0, count, workers + 1).astype(int).tolist()
+        for first, last in zip(bounds, bounds[1:]):
+            conn, child = context.Pipe()
+            args = (self.memory.name, count, size, first, seeds[first:last], child)
+            process = context.Process(target=run_worker, args=args, daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def check_workers(self):
+        for process in self.processes:
+            if not process.is_alive():
+                raise worker_died(process)
+
+    def receive(self, conn, process):
+        # a worker's answer, raises instead of waiting forever when it died
+        if conn not in wait([conn, process.sentinel]):
+            raise worker_died(process)
+        try:
+            conn.recv_bytes()
+        except EOFError:
+            raise worker_died(process) from None
+
+    def command(self, command):
+        self.check_workers()
+        for conn in self.conns:
+            conn.send_bytes(command)
+        for conn, process in zip(self.conns, self.processes):
+            self.receive(conn, process)
+
+    def reset(self):
+        if self.envs:
+            reset_envs(self.envs, self.block, 0)
+        else:
+            self.command(RESET)
+        return self.obs
+
+    def step_async(self, actions):
+        # workers play `actions` while the caller does something else
+        self.actions[:] = actions
+        if self.envs:
+            step_envs(self.envs, self.block, 0)
+        else:
+            self.check_workers()
+            for conn in self.conns:
+                conn.send_bytes(STEP)
+
+    def step_wait(self):
+        # -> (obs, rewards, dones, {"score": scores})
+        for conn, process in zip(self.conns, self.processes):
+            self.receive(conn, process)
+        return self.obs, self.rewards, self.dones, {"score": self.scores}
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        if self.memory is None:
+            return
+        # live workers let go of the block first, dead ones are only joined
+        for conn, process in zip(self.conns, self.processes):
+            try:
+                conn.send_bytes(CLOSE)
+                self.receive(conn, process)
+            except (OSError, RuntimeError):
+                process.terminate()
+            process.join()
+        del self.block, self.obs, self.actions, self.rewards, self.dones
+        del self.scores
+        self.release()
+        self.memory = None
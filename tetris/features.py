@@ -0,0 +1,108 @@
+# board evaluation features for bot heuristics & analytics
+#
+# boards are `bool_grid` layout, (rows, cols) or a (N, rows, cols) stack such
+# as `BatchEngine.boards`, row 0 at the bottom, True where filled
+# every feature is a numpy reduction over the whole stack:
+#   heights -> (N, cols) filled height of every column, 0 when empty
+#   aggregate_height -> sum of heights
+#   holes -> empty cells with a filled cell somewhere above them
+#   bumpiness -> sum of |height difference| of neighbouring columns
+#   row_transitions -> filled/empty changes along every row, the walls count
+#       as filled, so an empty row has 2
+#   column_transitions -> filled/empty changes up every column, the floor
+#       counts as filled, the open top doesn't
+#   wells -> sum of well depths, how far a column is below its lower
+#       neighbour, the walls are as high as the board
+#   complete_lines -> full rows
+# a single board gives scalars (and a (cols,) `heights`), `names` limits the
+# work to the features asked for
+import numpy as np
+
+FEATURES = (
+    "aggregate_height",
+    "holes",
+    "bumpiness",
+    "row_transitions",
+    "column_transitions",
+    "wells",
+    "complete_lines",
+)
+
+
+def as_stack(boards):
+    boards = np.asarray(boards, dtype=bool)
+    if boards.ndim == 2:
+        return boards[None]
+    if boards.ndim != 3:
+        raise ValueError(f"boards of shape {boards.shape}, not (N, rows, cols)")
+    return boards
+
+
+def column_heights(boards):
+    # index of the top filled cell + 1 per column, from the top down
+    stack = as_stack(boards)
+    rows = stack.shape[1]
+    flipped = stack[:, ::-1]
+    top = flipped.argmax(axis=1)
+    # argmax is 0 for empty columns too, only the top row tells them apart
+    heights = np.where((top != 0) | flipped[:, 0], rows - top, 0)
+    return heights[0] if np.ndim(boards) == 2 else heights
+
+
+def board_features(boards, names=FEATURES):
+    # -> {"heights": ..., name: ... for name in names}
+    stack = as_stack(boards)
+    n, rows, cols = stack.shape
+    heights = column_heights(stack)
+    features = {"heights": heights}
+
+    if "holes" in names or "complete_lines" in names:
+        # filled cells per row, summed as bytes
+        count = np.uint8 if cols < 256 else np.intp
+        row_counts = stack.view(np.uint8).sum(axis=2, dtype=count)
+    aggregate = heights.sum(axis=1)
+    if "aggregate_height" in names:
+        features["aggregate_height"] = aggregate
+    if "holes" in names:
+        # every filled cell is at or below its column height
+        filled = row_counts.sum(axis=1, dtype=aggregate.dtype)
+        features["holes"] = aggregate - filled
+    if "bumpiness" in names:
+        features["bumpiness"] = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+
+    if "row_transitions" in names:
+        features["row_transitions"] = (
+            np.count_nonzero(stack[:, :, 1:] != stack[:, :, :-1], axis=(1, 2))
+            + np.count_nonzero(~stack[:, :, 0], axis=1)
+            + np.count_nonzero(~stack[:, :, -1], axis=1)
+        )
+    if "column_transitions" in names:
+        features["column_transitions"] = np.count_nonzero(
+            stack[:, 1:] != stack[:, :-1], axis=(1, 2)
+        ) + np.count_nonzero(~stack[:, 0], axis=1)
+
+    if "wells" in names:
+        walls = np.full((n, 1), rows, dtype=heights.dtype)
+        padded = np.concatenate([walls, heights, walls], axis=1)
+        sides = np.minimum(padded[:, :-2], padded[:, 2:])
+        features["wells"] = np.maximum(sides - heights, 0).sum(axis=1)
+
+    if "complete_lines" in names:
+        features["complete_lines"] = np.count_nonzero(row_counts == cols, axis=1)
+
+    if np.ndim(boards) == 2:
+        return {name: value[0] for name, value in features.items()}
+    return features
+
+
+def feature_matrix(boards, names=FEATURES):
+    # (N, len(names)) float64, one column per feature
+    features = board_features(as_stack(boards), names)
+    return np.column_stack([features[name] for name in names]).astype(np.float64)
+
+
+def evaluate(boards, weights):
+    # linear heuristic, `weights` maps feature names to weights -> (N,) scores
+    names = tuple(weights)
+    matrix = feature_matrix(boards, names)
+    return matrix @ np.array([weights[name] for name in names], dtype=np.float64)
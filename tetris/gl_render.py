@@ -0,0 +1,174 @@
+import numpy as np
+from OpenGL.GL import (
+    GL_ARRAY_BUFFER,
+    GL_COLOR_BUFFER_BIT,
+    GL_FLOAT,
+    GL_LINES,
+    GL_NEAREST,
+    GL_QUADS,
+    GL_RGB,
+    GL_STATIC_DRAW,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_MAG_FILTER,
+    GL_TEXTURE_MIN_FILTER,
+    GL_UNPACK_ALIGNMENT,
+    GL_UNSIGNED_BYTE,
+    GL_VERTEX_ARRAY,
+    glBegin,
+    glBindBuffer,
+    glBindTexture,
+    glBufferData,
+    glClear,
+    glColor3ub,
+    glDisable,
+    glDisableClientState,
+    glDrawArrays,
+    glEnable,
+    glEnableClientState,
+    glEnd,
+    glGenBuffers,
+    glGenTextures,
+    glPixelStorei,
+    glTexCoord2f,
+    glTexImage2D,
+    glTexParameteri,
+    glTexSubImage2D,
+    glVertex2f,
+    glVertexPointer,
+)
+
+from .render import (
+    GRID_BG_COLOR,
+    GRID_LINE_COLOR,
+    GRID_SIZE,
+    CellRenderer,
+    to_pixel,
+)
+from .rules import DEFAULT_RULES
+
+
+class TextureRenderer(CellRenderer):
+    # draws the grid with GL instead of `glDrawPixels` of a CPU window:
+    # cell colors live in a grid_col x grid_row texture stretched over the
+    # window with nearest filtering, grid lines in a static vertex buffer
+    # a frame uploads at most grid_row * grid_col * 3 bytes, and nothing when
+    # no cell changed
+    #
+    # GL objects are created on first `draw()`, with a context current
+
+    def __init__(self, grid_size=GRID_SIZE, rules=None):
+        super().__init__()
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.grid_size = grid_size
+        self.width = grid_size * self.rules.grid_col
+        self.height = grid_size * self.rules.grid_row
+        self.line_color = to_pixel(GRID_LINE_COLOR)
+
+        shape = (self.rules.grid_row, self.rules.grid_col, 3)
+        self.cell_colors = np.empty(shape, dtype=np.uint8)
+        self.cell_colors[:, :] = to_pixel(GRID_BG_COLOR)
+        self.is_dirty = True
+
+        self.texture = None
+        self.line_buffer = None
+        self.line_count = 0
+        self.uploaded_bytes = 0
+
+    def render(self, game):
+        # only composes cells, uploading waits for `draw()`
+        cells = self.compose(game)
+        dirty = np.argwhere((cells != self.cell_colors).any(axis=2))
+        if len(dirty):
+            self.cell_colors = cells
+            self.is_dirty = True
+        return dirty
+
+    def grid_line_vertices(self):
+        # lines through the first pixel of every cell, same pixels as
+        # `GridRenderer`, running past the edges so no end pixel gets dropped
+        cols = np.arange(self.rules.grid_col)
+        rows = np.arange(self.rules.grid_row)
+        xs = -1 + (cols * self.grid_size + 0.5) * 2 / self.width
+        ys = -1 + (rows * self.grid_size + 0.5) * 2 / self.height
+
+        vertical = [((x, -2.0), (x, 2.0)) for x in xs]
+        horizontal = [((-2.0, y), (2.0, y)) for y in ys]
+        return np.array(vertical + horizontal, dtype=np.float32).reshape(-1, 2)
+
+    def setup(self):
+        # rows of 3 byte texels are not 4 byte aligned
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(
+            GL_TEXTURE_2D,
+            0,
+            GL_RGB,
+            self.rules.grid_col,
+            self.rules.grid_row,
+            0,
+            GL_RGB,
+            GL_UNSIGNED_BYTE,
+            self.cell_colors,
+        )
+        self.uploaded_bytes += self.cell_colors.nbytes
+        self.is_dirty = False
+
+        vertices = self.grid_line_vertices()
+        self.line_count = len(vertices)
+        self.line_buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.line_buffer)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def upload(self):
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexSubImage2D(
+            GL_TEXTURE_2D,
+            0,
+            0,
+            0,
+            self.rules.grid_col,
+            self.rules.grid_row,
+            GL_RGB,
+            GL_UNSIGNED_BYTE,
+            self.cell_colors,
+        )
+        self.uploaded_bytes += self.cell_colors.nbytes
+        self.is_dirty = False
+
+    def draw(self):
+        if self.texture is None:
+            self.setup()
+        elif self.is_dirty:
+            self.upload()
+
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        # cells, texture row 0 is the bottom row of the grid
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glColor3ub(255, 255, 255)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0, 0)
+        glVertex2f(-1, -1)
+        glTexCoord2f(1, 0)
+        glVertex2f(1, -1)
+        glTexCoord2f(1, 1)
+        glVertex2f(1, 1)
+        glTexCoord2f(0, 1)
+        glVertex2f(-1, 1)
+        glEnd()
+        glDisable(GL_TEXTURE_2D)
+
+        # grid lines
+        glColor3ub(*self.line_color.tolist())
+        glBindBuffer(GL_ARRAY_BUFFER, self.line_buffer)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, None)
+        glDrawArrays(GL_LINES, 0, self.line_count)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
@@ -0,0 +1,112 @@
+# zobrist hashing of board occupancy and an LRU transposition cache
+#
+# a board's hash is the xor of `cells[row][col]` keys over its filled cells,
+# boards keep it in `board.hash` and update it on lock & line clear,
+# `TetrisEngine.state_hash()` mixes in the current shape & rotation
+import random
+from collections import OrderedDict
+
+# fixed seed, hashes are stable across processes and runs
+ZOBRIST_SEED = 0x7E7215
+# rows up to `ROW_TABLE_BITS` columns hash with one table lookup, wider
+# ones `ROW_CHUNK` columns at a time, one table per chunk
+ROW_TABLE_BITS = 12
+ROW_CHUNK = 8
+CHUNK_MASK = (1 << ROW_CHUNK) - 1
+
+
+def row_keys(cell_keys):
+    # xor of cell keys for every bit mask of `len(cell_keys)` columns
+    keys = [0] * (1 << len(cell_keys))
+    for mask in range(1, len(keys)):
+        low = mask & -mask
+        keys[mask] = keys[mask ^ low] ^ cell_keys[low.bit_length() - 1]
+    return keys
+
+
+class ZobristKeys:
+    # random 64 bit keys of one board size & piece set, built by `Rules`
+
+    def __init__(self, grid_row, grid_col, shapes):
+        keys = random.Random(ZOBRIST_SEED)
+        self.cells = [
+            [keys.getrandbits(64) for _ in range(grid_col)] for _ in range(grid_row)
+        ]
+        self.pieces = {
+            name: [keys.getrandbits(64) for _ in rotations]
+            for name, rotations in shapes.items()
+        }
+        chunk = grid_col if grid_col <= ROW_TABLE_BITS else ROW_CHUNK
+        self.rows = [
+            [row_keys(cell_keys[i : i + chunk]) for i in range(0, grid_col, chunk)]
+            for cell_keys in self.cells
+        ]
+
+    def board_hash(self, rows, start=0):
+        # hash of `row_masks()` style rows, from row `start` up
+        h = 0
+        if len(self.rows[0]) == 1:
+            for x in range(start, len(rows)):
+                h ^= self.rows[x][0][rows[x]]
+            return h
+
+        for x in range(start, len(rows)):
+            row = rows[x]
+            for keys in self.rows[x]:
+                h ^= keys[row & CHUNK_MASK]
+                row >>= ROW_CHUNK
+        return h
+
+
+class TranspositionCache:
+    # hash -> value (evaluated score, best placement, ...) with at most
+    # `max_size` entries, least recently used go first
+
+    def __init__(self, max_size=1 << 16):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        value = self.entries.get(key, self)
+        if value is self:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,91 @@
+# fixed timestep game loop, independent of how often frames get drawn
+#
+# key presses are queued as they arrive and played once per frame, gravity
+# ticks run on their own simulation clock, one every `gravity_interval()`
+# seconds, faster with every level of cleared lines
+# the caller composes & draws at most one frame per `advance()`, and only
+# when it played something
+import time
+from collections import deque
+
+from .engine import TICK
+
+## gravity, seconds per row at level 0, times `SPEEDUP` per level
+GRAVITY = 1.0
+SPEEDUP = 0.85
+MIN_GRAVITY = 0.05
+LINES_PER_LEVEL = 10
+
+# ticks one `advance()` plays at most, after a stall (window dragged,
+# debugger) the game drops the missed time instead of falling all at once
+MAX_TICKS = 4
+
+
+class GameLoop:
+    # `on_step(action)` sees every action in the order it's played, e.g. a
+    # `ReplayRecorder.record`
+
+    def __init__(
+        self,
+        game,
+        gravity=GRAVITY,
+        speedup=SPEEDUP,
+        min_gravity=MIN_GRAVITY,
+        lines_per_level=LINES_PER_LEVEL,
+        on_step=None,
+        clock=time.perf_counter,
+    ):
+        self.game = game
+        self.gravity = gravity
+        self.speedup = speedup
+        self.min_gravity = min_gravity
+        self.lines_per_level = lines_per_level
+        self.on_step = on_step
+        self.clock = clock
+
+        self.inputs = deque()
+        # simulation time not yet played as ticks
+        self.lag = 0.0
+        self.last_time = None
+
+    @property
+    def level(self):
+        return self.game.lines // self.lines_per_level
+
+    def gravity_interval(self):
+        return max(self.min_gravity, self.gravity * self.speedup**self.level)
+
+    def push(self, action):
+        # from input callbacks, nothing is played or drawn until `advance()`
+        self.inputs.append(action)
+
+    def play(self, action):
+        self.game.step(action)
+        if self.on_step is not None:
+            self.on_step(action)
+
+    def advance(self, now=None):
+        # plays queued inputs then due ticks, returns how many actions ran,
+        # 0 means the last frame is still up to date
+        now = self.clock() if now is None else now
+        if self.last_time is not None:
+            self.lag += now - self.last_time
+        self.last_time = now
+
+        played = 0
+        while self.inputs:
+            self.play(self.inputs.popleft())
+            played += 1
+
+        ticks = 0
+        interval = self.gravity_interval()
+        while self.lag >= interval:
+            if ticks == MAX_TICKS:
+                self.lag = 0.0
+                break
+            self.lag -= interval
+            self.play(TICK)
+            ticks += 1
+            interval = self.gravity_interval()
+
+        return played + ticks
@@ -0,0 +1,222 @@
+# every distinct landing placement of a shape, with the keys to reach it
+#
+# breadth first search over (rotation, row, col) states using the engine's
+# own moves (LEFT, RIGHT, both rotations, TICK one row down) plus DROP from any
+# state to its landing, so paths are shortest key sequences and include tucks and
+# spins under overhangs
+#
+# collision runs on `row_masks()` ints with the precomputed `rules.shape_masks`,
+# results are cached per zobrist hash of (board, shape, rotation) and position
+from collections import namedtuple
+
+from .board import row_heights
+from .engine import DROP, LEFT, RIGHT, ROTATE, ROTATE_CW, TICK
+from .hashing import TranspositionCache
+from .rules import CCW, CW, DEFAULT_RULES
+
+# rotation, x, y the shape locks at, `path` ends with DROP
+Placement = namedtuple("Placement", "rotation x y path")
+
+# states are packed into one int, rows & columns shifted since shapes with
+# empty bottom rows or left columns sit at negative `x` / `y`
+# spans fit boards up to 248 rows and 120 columns
+X_OFFSET = 4
+X_SPAN = 256
+Y_OFFSET = 4
+Y_SPAN = 128
+
+
+def pack(rotation, x, y):
+    return (rotation * X_SPAN + x + X_OFFSET) * Y_SPAN + y + Y_OFFSET
+
+
+def unpack(state):
+    rest, y = divmod(state, Y_SPAN)
+    rotation, x = divmod(rest, X_SPAN)
+    return rotation, x - X_OFFSET, y - Y_OFFSET
+
+
+def collider(rows, shape_type, rules):
+    # `collides(rotation, x, y)` of the shape on `rows`, same rules as
+    # `BitBoard.collides`
+    masks = rules.shape_masks[shape_type]
+    bounds = rules.shape_bounds[shape_type]
+    top = rules.grid_row - 1
+    grid_col = rules.grid_col
+
+    def collides(rotation, x, y):
+        min_dy, max_dy = bounds[rotation]
+        left = y + min_dy
+        if left < 0 or y + max_dy >= grid_col:
+            return True
+        for dx, mask in masks[rotation]:
+            r = x + dx
+            if r < 0:
+                return True
+            if rows[r if r < top else top] & (mask << left):
+                return True
+        return False
+
+    return collides
+
+
+def search(rows, shape_type, start, rules=DEFAULT_RULES):
+    # -> list of Placement, `rows` as from `row_masks()`
+    tests = rules.rotation_tests[shape_type]
+    collides = collider(rows, shape_type, rules)
+
+    start = pack(*start)
+    # state -> (previous state, action)
+    parent = {start: None}
+    queue = [start]
+    # landing state -> state DROP was pressed from
+    landings = {}
+    drops = {}
+
+    for state in queue:
+        rotation, x, y = unpack(state)
+
+        # landing of this state, memoized for every state on the way down
+        lx = x
+        passed = []
+        while True:
+            below = pack(rotation, lx, y)
+            if below in drops:
+                landing = drops[below]
+                break
+            passed.append(below)
+            if collides(rotation, lx - 1, y):
+                landing = below
+                break
+            lx -= 1
+        for below in passed:
+            drops[below] = landing
+        if landing not in landings:
+            landings[landing] = state
+
+        moves = []
+        if not collides(rotation, x, y - 1):
+            moves.append((pack(rotation, x, y - 1), LEFT))
+        if not collides(rotation, x, y + 1):
+            moves.append((pack(rotation, x, y + 1), RIGHT))
+        if landing != state:
+            moves.append((state - Y_SPAN, TICK))
+        for direction, action in ((CCW, ROTATE), (CW, ROTATE_CW)):
+            for turned, dx, dy, low in tests[direction][rotation]:
+                if low + x + dx > 0 and not collides(turned, x + dx, y + dy):
+                    moves.append((pack(turned, x + dx, y + dy), action))
+                    break
+
+        for nxt, action in moves:
+            if nxt not in parent:
+                parent[nxt] = (state, action)
+                queue.append(nxt)
+
+    placements = []
+    for landing, state in landings.items():
+        path = [DROP]
+        while parent[state] is not None:
+            state, action = parent[state]
+            path.append(action)
+        path.reverse()
+        placements.append(Placement(*unpack(landing), tuple(path)))
+
+    return placements
+
+
+def drop_paths(rows, shape_type, start, rules=DEFAULT_RULES, heights=None):
+    # -> list of Placement reached by turning the shape where it is, sliding
+    # it sideways & DROP, no tucks or spins, a few mask tests per placement
+    # instead of a whole search. from the spawn over a stack below the top
+    # rows these are all of `search`'s straight drops
+    # `heights` are the board's column heights (`board.heights`)
+    tests = rules.rotation_tests[shape_type]
+    collides = collider(rows, shape_type, rules)
+    if heights is None:
+        heights = row_heights(rows, rules)
+    turns = len(rules.shapes[shape_type])
+    found = {}
+
+    for rotation in range(turns):
+        # the shorter way round, counter-clockwise on ties
+        count = (rotation - start[0]) % turns
+        direction, action = CCW, ROTATE
+        if count > turns - count:
+            count, direction, action = turns - count, CW, ROTATE_CW
+        index, x, y = start
+        turned_path = []
+        for _ in range(count):
+            for turned, dx, dy, low in tests[direction][index]:
+                if low + x + dx > 0 and not collides(turned, x + dx, y + dy):
+                    index, x, y = turned, x + dx, y + dy
+                    turned_path.append(action)
+                    break
+            else:
+                break
+        if index != rotation:
+            continue
+
+        for step, action in ((0, None), (-1, LEFT), (1, RIGHT)):
+            slide = y
+            path = list(turned_path)
+            while True:
+                if step:
+                    if collides(rotation, x, slide + step):
+                        break
+                    slide += step
+                    path.append(action)
+                lx = rules.landing_row(heights, shape_type, rotation, x, slide)
+                if lx is None:
+                    lx = x
+                    while not collides(rotation, lx - 1, slide):
+                        lx -= 1
+                landing = (rotation, lx, slide)
+                if landing not in found:
+                    found[landing] = Placement(*landing, tuple(path) + (DROP,))
+                if not step:
+                    break
+
+    return list(found.values())
+
+
+class MoveGenerator:
+    # `search` with a `TranspositionCache`, `rows_hash` skips rehashing the
+    # rows when the caller has the board's hash already
+    # one generator serves games of one `rules`
+
+    def __init__(self, cache_size=4096, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.cache = TranspositionCache(cache_size)
+
+    @property
+    def hits(self):
+        return self.cache.hits
+
+    @property
+    def misses(self):
+        return self.cache.misses
+
+    def placements(self, rows, shape_type, start=None, rows_hash=None):
+        keys = self.rules.keys
+        if start is None:
+            start = (0, *self.rules.spawn_pos)
+        if rows_hash is None:
+            rows_hash = keys.board_hash(rows)
+
+        rotation, x, y = start
+        key = (rows_hash ^ keys.pieces[shape_type][rotation], x, y)
+        found = self.cache.get(key)
+        if found is None:
+            found = search(rows, shape_type, start, self.rules)
+            self.cache.put(key, found)
+        return found
+
+    def for_game(self, game):
+        # placements of the game's current shape from where it is now
+        x, y = game.current_pos
+        return self.placements(
+            game.board.row_masks(),
+            game.current_shape_type,
+            (game.shape_index, x, y),
+            game.board.hash,
+        )
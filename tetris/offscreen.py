@@ -0,0 +1,198 @@
+# renders replays to png thumbnails, png frame sequences or video, no window
+#
+# frames are the `GridRenderer.window` the GLUT frontend shows (background,
+# locked cells, ghost, current shape, grid lines), composed on the CPU, so
+# this runs on servers without a display or GL
+# a frame is written after every action that changed a cell, video goes
+# through an `ffmpeg` process reading raw rgb from a pipe
+#
+# run: python -m tetris.offscreen replays/*.ttr --out thumbs --workers 8
+#      python -m tetris.offscreen game.ttr --out frames --mode frames
+#      python -m tetris.offscreen game.ttr --out videos --mode video --fps 30
+import argparse
+import os
+import shutil
+import struct
+import subprocess
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .render import GRID_SIZE, GridRenderer
+from .replay import decode_replay, load_replay, new_game, replay
+
+MODES = ("thumbnail", "frames", "video")
+THUMBNAIL_GRID_SIZE = 10
+PNG_LEVEL = 6
+
+
+def png_chunk(kind, data):
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def encode_png(pixels):
+    # (height, width, 3) uint8, first row on top
+    height, width, _ = pixels.shape
+    # every scanline starts with filter type 0
+    raw = np.zeros((height, 1 + width * 3), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            png_chunk(b"IHDR", header),
+            png_chunk(b"IDAT", zlib.compress(raw.tobytes(), PNG_LEVEL)),
+            png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def to_image(window):
+    # window row 0 is the bottom of the screen, as `glDrawPixels` takes it
+    return window[::-1]
+
+
+def write_png(path, window):
+    with open(path, "wb") as f:
+        f.write(encode_png(to_image(window)))
+
+
+def replay_frames(data, grid_size):
+    # yields the renderer's window after every action that changed a cell,
+    # the same array every time, copy it to keep it
+    seed, rules, actions = decode_replay(data)
+    game = new_game(seed, rules=rules)
+    renderer = GridRenderer(grid_size, rules)
+    renderer.render(game)
+    yield renderer.window
+
+    for action in actions:
+        game.step(action)
+        if len(renderer.render(game)):
+            yield renderer.window
+
+
+class PngSequenceWriter:
+    # out/000000.png, out/000001.png, ...
+
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.count = 0
+
+    def write(self, window):
+        write_png(os.path.join(self.path, f"{self.count:06d}.png"), window)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class FFmpegWriter:
+    # raw rgb frames into an `ffmpeg` process
+
+    def __init__(self, path, width, height, fps=30):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("video needs ffmpeg on PATH")
+
+        command = [ffmpeg, "-loglevel", "error", "-y"]
+        command += ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}"]
+        command += ["-r", str(fps), "-i", "-"]
+        # yuv420p wants even sizes
+        command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p"]
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+        self.count = 0
+
+    def write(self, window):
+        self.process.stdin.write(np.ascontiguousarray(to_image(window)).tobytes())
+        self.count += 1
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with {self.process.returncode}")
+
+
+def render_replay(path, out_dir, mode="thumbnail", grid_size=None, fps=30):
+    # renders one replay file, returns its stats
+    if grid_size is None:
+        grid_size = THUMBNAIL_GRID_SIZE if mode == "thumbnail" else GRID_SIZE
+    name = os.path.splitext(os.path.basename(path))[0]
+    start = time.perf_counter()
+    data = load_replay(path)
+
+    count = 0
+    if mode == "thumbnail":
+        # final state only, the game runs at full speed without composing
+        game = replay(data)
+        renderer = GridRenderer(grid_size, game.rules)
+        renderer.render(game)
+        write_png(os.path.join(out_dir, f"{name}.png"), renderer.window)
+        count = 1
+    else:
+        writer = None
+        for window in replay_frames(data, grid_size):
+            if writer is None:
+                if mode == "frames":
+                    writer = PngSequenceWriter(os.path.join(out_dir, name))
+                else:
+                    height, width, _ = window.shape
+                    mp4 = os.path.join(out_dir, f"{name}.mp4")
+                    writer = FFmpegWriter(mp4, width, height, fps)
+            writer.write(window)
+            count += 1
+        writer.close()
+
+    return {"path": path, "frames": count, "seconds": time.perf_counter() - start}
+
+
+def render_replays(paths, out_dir, mode="thumbnail", workers=None, **options):
+    # yields per replay stats as workers finish them
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(render_replay, path, out_dir, mode, **options)
+            for path in paths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="render replays without a window")
+    parser.add_argument("replays", nargs="+")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--mode", choices=MODES, default="thumbnail")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--grid-size", type=int, default=None, help="cell pixels")
+    parser.add_argument("--fps", type=int, default=30, help="video frame rate")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    frames = 0
+    for result in render_replays(
+        args.replays,
+        args.out,
+        args.mode,
+        args.workers,
+        grid_size=args.grid_size,
+        fps=args.fps,
+    ):
+        frames += result["frames"]
+        rate = result["frames"] / result["seconds"]
+        print(f"{result['path']}: {result['frames']} frames, {rate:,.0f} frames/s")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(args.replays)} replays, {frames} frames in {elapsed:.2f}s, "
+        f"{len(args.replays) / elapsed:,.1f} replays/s, "
+        f"{frames / elapsed:,.0f} frames/s on {args.workers} workers"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# optional per stage timings, frame time and input to photon latency
+#
+# a disabled `Profiler` wraps nothing, `timed()` hands functions back as they
+# are, so the only cost left is a flag check in the frame hooks
+# an enabled one keeps the last `SAMPLES` durations of every series for
+# p50/p95/p99, plus running count & sum, and can dump them as json or
+# prometheus text (`.prom`) to a local file every `dump_interval` seconds
+import json
+import os
+import time
+from collections import deque
+from functools import wraps
+
+import numpy as np
+
+SAMPLES = 1024
+PERCENTILES = (50, 95, 99)
+
+# series with their own prometheus metric, the rest are `tetris_stage_seconds`
+FRAME = "frame"
+INPUT_LATENCY = "input_to_photon"
+METRICS = {
+    FRAME: "tetris_frame_seconds",
+    INPUT_LATENCY: "tetris_input_latency_seconds",
+}
+
+
+class Series:
+    def __init__(self, samples=SAMPLES):
+        self.samples = deque(maxlen=samples)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        summary = {"count": self.count, "sum": self.total}
+        values = np.fromiter(self.samples, dtype=np.float64)
+        if not len(values):
+            values = np.zeros(1)
+        for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            summary[f"p{p}"] = float(value)
+        return summary
+
+
+class Profiler:
+    def __init__(self, enabled=False, dump_path=None, dump_interval=5.0):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.clock = time.perf_counter
+
+        self.series = {}
+        self.last_frame = None
+        self.last_dump = None
+        # key press times, waiting to be played, then to be shown
+        self.inputs = []
+        self.played = []
+
+    def record(self, name, seconds):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = Series()
+        series.add(seconds)
+
+    def timed(self, name, fn):
+        # `fn` timed under `name`, or `fn` itself when disabled
+        if not self.enabled:
+            return fn
+
+        clock = self.clock
+        record = self.record
+
+        @wraps(fn)
+        def timed_fn(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+
+        return timed_fn
+
+    def instrument(self, obj, *names):
+        # times methods of one instance, names it doesn't have are skipped
+        if not self.enabled:
+            return
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self.timed(name, method))
+
+    ## frame hooks, called every frame whether enabled or not
+
+    def frame(self):
+        # start of a frame, frame time is the time between two of these
+        if not self.enabled:
+            return
+        now = self.clock()
+        if self.last_frame is not None:
+            self.record(FRAME, now - self.last_frame)
+        self.last_frame = now
+        self.maybe_dump(now)
+
+    def input(self):
+        # a key press, before it's queued
+        if self.enabled:
+            self.inputs.append(self.clock())
+
+    def inputs_played(self):
+        # queued key presses went into the game, the next swap shows them
+        if self.enabled:
+            self.played.extend(self.inputs)
+            self.inputs.clear()
+
+    def presented(self):
+        # right after the buffer swap
+        if not self.enabled or not self.played:
+            return
+        now = self.clock()
+        for pressed in self.played:
+            self.record(INPUT_LATENCY, now - pressed)
+        self.played.clear()
+
+    ## results
+
+    def summary(self):
+        return {name: series.summary() for name, series in self.series.items()}
+
+    def overlay_lines(self):
+        # a header then one line per series, milliseconds
+        lines = ["ms  " + " ".join(f"p{p}" for p in PERCENTILES)]
+        for name, summary in sorted(self.summary().items()):
+            values = " ".join(f"{summary[f'p{p}'] * 1000:.2f}" for p in PERCENTILES)
+            lines.append(f"{name} {values}")
+        return lines
+
+    def to_json(self):
+        return json.dumps({"time": time.time(), "series": self.summary()}, indent=2)
+
+    def to_prometheus(self):
+        # every line of a metric has to come together
+        series = sorted(
+            (METRICS.get(name, "tetris_stage_seconds"), name, summary)
+            for name, summary in self.summary().items()
+        )
+        out = []
+        typed = set()
+        for metric, name, summary in series:
+            labels = "" if name in METRICS else f'stage="{name}",'
+            if metric not in typed:
+                out.append(f"# TYPE {metric} summary")
+                typed.add(metric)
+            for p in PERCENTILES:
+                quantile = p / 100
+                value = summary[f"p{p}"]
+                out.append(f'{metric}{{{labels}quantile="{quantile}"}} {value:.9f}')
+            labels = labels.rstrip(",")
+            suffix = f"{{{labels}}}" if labels else ""
+            out.append(f"{metric}_sum{suffix} {summary['sum']:.9f}")
+            out.append(f"{metric}_count{suffix} {summary['count']}")
+        return "\n".join(out) + "\n"
+
+    def dump(self, path=None):
+        # whole file replaced at once, readers never see half a dump
+        path = self.dump_path if path is None else path
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def maybe_dump(self, now):
+        if self.dump_path is None:
+            return
+        if self.last_dump is None:
+            self.last_dump = now
+        elif now - self.last_dump >= self.dump_interval:
+            self.dump()
+            self.last_dump = now
@@ -0,0 +1,134 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import COLORS
+from .rules import DEFAULT_RULES
+
+## Color Constants:
+WINDOW_BG = (0.1451, 0.1451, 0.20784)
+GRID_BG_COLOR = (0.08627, 0.08627, 0.11373)
+GRID_BG_COLOR = (0, 0, 0)
+GRID_LINE_COLOR = (1, 0.3, 1)
+GRID_LINE_COLOR = (0.1451, 0.1451, 0.20784)
+GRID_EMPTY_CELL_ALT = (0.03627, 0.08627, 0.031373)
+
+## grid width & height
+GRID_SIZE = 30
+
+
+def to_pixel(color):
+    # 0..1 float rgb to what ends up in the uint8 window
+    return (np.array(color) * 255).astype(np.uint8)
+
+
+# pixel color of every board `cells` value, empty cells show the grid bg
+CELL_PIXELS = to_pixel([GRID_BG_COLOR] + COLORS)
+
+
+@lru_cache(maxsize=None)
+def cell_line_mask(grid_size):
+    # grid line pixels inside one cell block, its bottom row & left column
+    # built once per `grid_size` and shared by every renderer
+    mask = np.zeros((grid_size, grid_size), dtype=bool)
+    mask[0, :] = True
+    mask[:, 0] = True
+    mask.flags.writeable = False
+    return mask
+
+
+class CellRenderer:
+    # turns engine state into one color per cell, shared by every renderer
+
+    def __init__(self):
+        # empty cells after game over, picked once per game over
+        self.game_over_color = None
+
+    def compose(self, game):
+        # color every cell should show, (grid_row, grid_col, 3) uint8
+        cells = CELL_PIXELS[game.cells]
+        grid_row = len(cells)
+
+        if game.is_game_over:
+            if self.game_over_color is None:
+                self.game_over_color = to_pixel(np.random.uniform(0.2, 0.3, 3))
+            cells[game.cells == 0] = self.game_over_color
+            return cells
+        self.game_over_color = None
+
+        ghost_color = to_pixel(np.array(game.current_color) * 0.3)
+        for x, y in game.get_ghost_shape():
+            if x < grid_row:
+                cells[x, y] = ghost_color
+
+        color = to_pixel(game.current_color)
+        for x, y in game.get_cells():
+            if x < grid_row:
+                cells[x, y] = color
+
+        return cells
+
+
+class GridRenderer(CellRenderer):
+    # paints engine state into `self.window`, a (height, width, 3) uint8 matrix
+    # keeps the color each cell is painted with, so a frame only rewrites the
+    # pixel blocks of cells that changed (moved shape, ghost, locked or
+    # cleared rows) instead of the whole grid
+    # `rules` sets how many cells there are, it must match the game's
+
+    def __init__(self, grid_size=GRID_SIZE, rules=None):
+        super().__init__()
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.grid_size = grid_size
+        self.grid_width = grid_size * self.rules.grid_col
+        self.grid_height = grid_size * self.rules.grid_row
+        self.width = self.grid_width
+        self.height = self.grid_height
+        self.grid_offset_x = self.width - self.grid_width
+
+        # using a matrix for whole window
+        self.window = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        # change whole window background color
+        self.window[:, :, :] = to_pixel(WINDOW_BG)
+
+        # extracting grid portion from matrix
+        self.grid = self.window[
+            : self.grid_height,
+            self.grid_offset_x : self.grid_offset_x + self.grid_width,
+            :,
+        ]
+        self.grid[:, :, :] = to_pixel(GRID_BG_COLOR)
+
+        # grid lines are baked into every cell block as it gets painted, so
+        # nothing needs to redraw them per frame
+        self.line_mask = cell_line_mask(grid_size)
+        self.line_color = to_pixel(GRID_LINE_COLOR)
+        self.draw_grid_lines()
+
+        # what every cell shows right now
+        shape = (self.rules.grid_row, self.rules.grid_col, 3)
+        self.cell_colors = np.empty(shape, dtype=np.uint8)
+        self.cell_colors[:, :] = to_pixel(GRID_BG_COLOR)
+
+    def draw_grid_lines(self):
+        # whole grid in one go, tiling the cell mask over every block
+        mask = np.tile(self.line_mask, (self.rules.grid_row, self.rules.grid_col))
+        self.grid[mask] = self.line_color
+
+    def fill_grid(self, color, x, y):
+        x = x * self.grid_size
+        y = y * self.grid_size
+        block = self.grid[x : x + self.grid_size, y : y + self.grid_size, :]
+        block[:, :, :] = color
+        block[self.line_mask] = self.line_color
+
+    def render(self, game):
+        # repaint changed cells only, returns them as (row, col) pairs
+        cells = self.compose(game)
+        dirty = np.argwhere((cells != self.cell_colors).any(axis=2))
+
+        for x, y in dirty:
+            self.fill_grid(cells[x, y], x, y)
+
+        self.cell_colors = cells
+        return dirty
@@ -0,0 +1,162 @@
+# compact binary replays: a seed & board size plus the action stream of one game
+#
+#   b"TTR" + version byte
+#   varint seed, varint rows, varint cols
+#   records: varint(ticks << 3 | action)
+#
+# `ticks` is how many gravity ticks ran since the previous record, so timer
+# ticks cost nothing on their own, and a key press is usually one byte
+# the last record uses `END` to flush trailing ticks
+#
+# run: python -m tetris.replay FILE...
+import random
+import sys
+import time
+
+from .engine import DROP, LEFT, RIGHT, ROTATE, ROTATE_CW, TICK, TetrisEngine
+from .rules import DEFAULT_RULES, get_rules
+
+MAGIC = b"TTR"
+# 2: rotations turn one step with kicks, `ROTATE_CW`
+# 3: board size in the header
+VERSION = 3
+
+# action code of the trailing ticks only record
+END = 7
+ACTION_BITS = 3
+
+INPUT_ACTIONS = (LEFT, RIGHT, DROP, ROTATE, ROTATE_CW)
+
+
+def new_seed():
+    return random.randrange(1 << 63)
+
+
+def new_game(seed, board=None, rules=None):
+    # same seed, same shapes & colors
+    return TetrisEngine(random.Random(seed), board, rules)
+
+
+def write_varint(out, value):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    # feed every action given to the engine, in order
+
+    def __init__(self, seed, rules=None):
+        self.seed = seed
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.data = bytearray(MAGIC)
+        self.data.append(VERSION)
+        for value in (seed, self.rules.grid_row, self.rules.grid_col):
+            write_varint(self.data, value)
+        self.ticks = 0
+
+    def record(self, action):
+        if action == TICK:
+            self.ticks += 1
+            return
+        if action not in INPUT_ACTIONS:
+            raise ValueError(f"unknown action {action}")
+
+        write_varint(self.data, self.ticks << ACTION_BITS | action)
+        self.ticks = 0
+
+    def to_bytes(self):
+        data = bytearray(self.data)
+        if self.ticks:
+            write_varint(data, self.ticks << ACTION_BITS | END)
+        return bytes(data)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def encode_replay(seed, actions, rules=None):
+    recorder = ReplayRecorder(seed, rules)
+    for action in actions:
+        recorder.record(action)
+    return recorder.to_bytes()
+
+
+def decode_header(data):
+    if data[:3] != MAGIC:
+        raise ValueError("not a replay")
+    if data[3] != VERSION:
+        raise ValueError(f"unsupported replay version {data[3]}")
+    # -> (seed, rules of the recorded board size, records start)
+    seed, pos = read_varint(data, 4)
+    rows, pos = read_varint(data, pos)
+    cols, pos = read_varint(data, pos)
+    return seed, get_rules(rows, cols), pos
+
+
+def decode_records(data, pos):
+    # yields (ticks, action), `action` is `END` for the trailing ticks
+    mask = (1 << ACTION_BITS) - 1
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        yield value >> ACTION_BITS, value & mask
+
+
+def decode_replay(data):
+    # (seed, rules, list of actions)
+    seed, rules, pos = decode_header(data)
+    actions = []
+    for ticks, action in decode_records(data, pos):
+        actions.extend([TICK] * ticks)
+        if action != END:
+            actions.append(action)
+    return seed, rules, actions
+
+
+def replay(data, board=None):
+    # runs the whole game at full speed on the recorded board size, returns
+    # the final engine, `board` has to be of that size
+    seed, rules, pos = decode_header(data)
+    game = new_game(seed, board, rules)
+    step = game.step
+
+    for ticks, action in decode_records(data, pos):
+        for _ in range(ticks):
+            step(TICK)
+        if action != END:
+            step(action)
+
+    return game
+
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def main(paths):
+    start = time.perf_counter()
+    for path in paths:
+        game = replay(load_replay(path))
+        print(f"{path}: score {game.score} lines {game.lines} pieces {game.pieces}")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} replays in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,204 @@
+# board size & piece set of a game, with every per shape table built once
+#
+# engines, boards, renderers and the move generator read their dimensions
+# and shape data from a `Rules` instead of the module constants, so games of
+# different sizes or piece sets can run side by side in one process
+# `get_rules()` hands out one shared instance per (rows, cols, piece set),
+# games only keep a reference to it
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import GRID_COL, GRID_ROW, SHAPES
+from .hashing import ZobristKeys
+
+# named piece sets for `get_rules`, any dict shaped like `SHAPES` works with
+# `Rules` directly
+PIECE_SETS = {
+    "tetromino": SHAPES,
+}
+
+## rotation directions, `rotation_tests` / `turns` index
+CCW, CW = 0, 1
+
+# (row, col) offsets a rotation tries in order when the shape doesn't fit in
+# place, the I piece reaches two columns so it can turn flat against a wall
+KICKS = {
+    "O": ((0, 0),),
+    "I": ((0, 0), (0, -1), (0, 1), (0, -2), (0, 2)),
+}
+DEFAULT_KICKS = ((0, 0), (0, -1), (0, 1))
+
+
+def shape_row_masks(shape):
+    # [(row offset, column bits), ...], bit 0 is the shape's leftmost column
+    min_dy = min(dy for _, dy in shape)
+    masks = {}
+    for dx, dy in shape:
+        masks[dx] = masks.get(dx, 0) | (1 << (dy - min_dy))
+    return tuple(sorted(masks.items()))
+
+
+def normalized(shape):
+    # cells moved to the origin, to compare rotations by form only
+    min_dx = min(dx for dx, _ in shape)
+    min_dy = min(dy for _, dy in shape)
+    return frozenset((dx - min_dx, dy - min_dy) for dx, dy in shape)
+
+
+def rotation_turns(rotations):
+    # (ccw, cw) -> per rotation the index the shape turns into, found by
+    # turning the cells, so the order `SHAPES` lists rotations in doesn't
+    # matter
+    forms = [normalized(shape) for shape in rotations]
+    cw = []
+    for shape in rotations:
+        # row up & col right, a quarter turn clockwise is (r, c) -> (-c, r)
+        turned = normalized([(-dy, dx) for dx, dy in shape])
+        if turned not in forms:
+            raise ValueError(f"rotation of {sorted(shape)} is not in its set")
+        cw.append(forms.index(turned))
+    ccw = [cw.index(i) for i in range(len(cw))]
+    return ccw, cw
+
+
+def shape_columns(shape):
+    # [(col offset, lowest row offset in that column), ...]
+    lowest = {}
+    for dx, dy in shape:
+        lowest[dy] = min(dx, lowest.get(dy, dx))
+    return tuple(sorted(lowest.items()))
+
+
+def shape_tops(shape):
+    # [(col offset, highest row offset in that column), ...]
+    highest = {}
+    for dx, dy in shape:
+        highest[dy] = max(dx, highest.get(dy, dx))
+    return tuple(sorted(highest.items()))
+
+
+class Rules:
+    # grid_row x grid_col board played with `shapes`, same layout as `SHAPES`
+
+    def __init__(self, grid_row=GRID_ROW, grid_col=GRID_COL, shapes=SHAPES):
+        self.grid_row = grid_row
+        self.grid_col = grid_col
+        self.shapes = shapes
+        self.shape_names = list(shapes.keys())
+        # new shapes start just above the grid
+        self.spawn_pos = (grid_row, grid_col // 2)
+        spawn_col = self.spawn_pos[1]
+        for name, rotations in shapes.items():
+            cols = [spawn_col + dy for _, dy in rotations[0]]
+            if min(cols) < 0 or max(cols) >= grid_col:
+                raise ValueError(
+                    f"{name} spawns outside a {grid_row}x{grid_col} board"
+                )
+
+        # every row filled, for `BitBoard`
+        self.full_row = (1 << grid_col) - 1
+        # bit of each column, packs a `bool_grid` row into a `BitBoard` row
+        self.col_bits = 1 << np.arange(grid_col, dtype=np.int64)
+
+        def per_rotation(table):
+            return {
+                name: [table(shape) for shape in rotations]
+                for name, rotations in shapes.items()
+            }
+
+        # per rotation (min col offset, max col offset), for wall checks
+        self.shape_bounds = per_rotation(
+            lambda shape: (min(dy for _, dy in shape), max(dy for _, dy in shape))
+        )
+        self.shape_masks = per_rotation(shape_row_masks)
+        self.shape_columns = per_rotation(shape_columns)
+        self.shape_tops = per_rotation(shape_tops)
+        # lowest row offset, rotating may not touch the bottom row
+        self.shape_lowest = per_rotation(lambda shape: min(dx for dx, _ in shape))
+
+        # rotation states & kicks: turns[name][direction][index] -> index,
+        # rotation_tests[name][direction][index] -> ((index, dx, dy, lowest),
+        # ...) every position a rotation may land on in the order tried, a
+        # rotation is at most `len(kicks)` lookups & collision tests
+        self.turns = {name: rotation_turns(shapes[name]) for name in shapes}
+        self.kicks = {name: KICKS.get(name, DEFAULT_KICKS) for name in shapes}
+        self.rotation_tests = {
+            name: tuple(
+                tuple(
+                    tuple(
+                        (turned, dx, dy, self.shape_lowest[name][turned])
+                        for dx, dy in self.kicks[name]
+                    )
+                    for turned in self.turns[name][direction]
+                )
+                for direction in (CCW, CW)
+            )
+            for name in shapes
+        }
+
+        # shape cells as arrays for `BatchEngine`, [shape, rotation, cell] ->
+        # row / col offset, shapes with fewer rotations repeat their first one
+        # (never picked, rotation wraps at `shape_rotations`), shapes with
+        # fewer cells their first cell (collides, locks & lowest row the same)
+        rotations = [len(shapes[name]) for name in self.shape_names]
+        cells = max(len(shape) for r in shapes.values() for shape in r)
+        padded = [
+            [
+                list(shape) + [shape[0]] * (cells - len(shape))
+                for shape in (
+                    shapes[name][i % len(shapes[name])] for i in range(max(rotations))
+                )
+            ]
+            for name in self.shape_names
+        ]
+        self.shape_rotations = np.array(rotations)
+        self.cell_x = np.array([[[dx for dx, _ in s] for s in r] for r in padded])
+        self.cell_y = np.array([[[dy for _, dy in s] for s in r] for r in padded])
+        # [direction, shape, rotation] -> rotation, [shape, kick] -> offset,
+        # shapes with fewer kicks repeat their last one
+        most = max(rotations)
+        self.turn_table = np.array(
+            [
+                [
+                    [self.turns[name][direction][i % count] for i in range(most)]
+                    for name, count in zip(self.shape_names, rotations)
+                ]
+                for direction in (CCW, CW)
+            ]
+        )
+        kicks = [self.kicks[name] for name in self.shape_names]
+        most = max(len(k) for k in kicks)
+        padded_kicks = [k + k[-1:] * (most - len(k)) for k in kicks]
+        self.kick_counts = np.array([len(k) for k in kicks])
+        self.kick_x = np.array([[dx for dx, _ in k] for k in padded_kicks])
+        self.kick_y = np.array([[dy for _, dy in k] for k in padded_kicks])
+
+        self.keys = ZobristKeys(grid_row, grid_col, shapes)
+
+    def __repr__(self):
+        return f"Rules({self.grid_row}x{self.grid_col}, {self.shape_names})"
+
+    def landing_row(self, heights, shape_type, index, x, y):
+        # row a shape at (x, y) lands on when dropped, from the column heights
+        # None when part of it is already below a column's surface (tucked
+        # under an overhang), then only walking down tells where it stops
+        columns = self.shape_columns[shape_type][index]
+        land = max(heights[y + dy] - low for dy, low in columns)
+        if land > x:
+            return None
+        return land
+
+
+def get_rules(grid_row=GRID_ROW, grid_col=GRID_COL, pieces="tetromino"):
+    # the cache keys on how it's called, so defaults are filled in first and
+    # `get_rules()` is `get_rules(20, 10)`
+    return shared_rules(grid_row, grid_col, pieces)
+
+
+@lru_cache(maxsize=None)
+def shared_rules(grid_row, grid_col, pieces):
+    return Rules(grid_row, grid_col, PIECE_SETS[pieces])
+
+
+DEFAULT_RULES = get_rules()
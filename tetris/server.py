@@ -0,0 +1,298 @@
+# many headless games behind one local socket, all in one asyncio event loop
+#
+# every connection is a session with its own `TetrisEngine` and `GameLoop`,
+# gravity runs on an event loop timer per session instead of `glutTimerFunc`
+# clients send the key bytes `keyboard()` takes, `h` `l` `j` & space, `q`
+# ends the session, other bytes are read & ignored
+# the server answers with frames, each a varint length then:
+#   HELLO  kind, varint rows, varint cols, varint seed, once on connect
+#   UPDATE kind, varint ack, varint score, flags, varint count,
+#          count x (varint cell, color)
+# `ack` is how many key bytes were played so far (the ones before a `q`
+# included), `cell` is row * cols + col
+# and `color` the `PALETTE` index the cell shows now (current shape included,
+# 0 empty), only cells that changed since the last update are sent
+#
+# run: python -m tetris.server --port 7777
+#      python -m tetris.server --unix /tmp/tetris.sock --gravity 0.5
+import argparse
+import asyncio
+import os
+import random
+import signal
+import time
+
+import numpy as np
+
+from .constants import COLOR_INDEX
+from .engine import KEY_ACTIONS
+from .loop import GRAVITY, SPEEDUP, GameLoop
+from .replay import new_game, read_varint, write_varint
+from .rules import DEFAULT_RULES, get_rules
+
+HOST = "127.0.0.1"
+PORT = 7777
+
+## frame kinds & update flags
+HELLO, UPDATE = range(2)
+GAME_OVER = 1
+
+QUIT = ord("q")
+# key byte -> engine action
+KEY_BYTES = {key[0]: action for key, action in KEY_ACTIONS.items()}
+
+
+def encode_frame(body):
+    out = bytearray()
+    write_varint(out, len(body))
+    return out + body
+
+
+def encode_hello(rules, seed):
+    body = bytearray([HELLO])
+    for value in (rules.grid_row, rules.grid_col, seed):
+        write_varint(body, value)
+    return encode_frame(body)
+
+
+def encode_update(ack, score, flags, cells, colors):
+    body = bytearray([UPDATE])
+    write_varint(body, ack)
+    write_varint(body, score)
+    body.append(flags)
+    write_varint(body, len(cells))
+    for cell, color in zip(cells, colors):
+        write_varint(body, cell)
+        body.append(color)
+    return encode_frame(body)
+
+
+def decode_frames(buffer):
+    # complete frames at the start of `buffer` -> (frames, bytes used)
+    frames = []
+    pos = 0
+    while pos < len(buffer):
+        try:
+            length, start = read_varint(buffer, pos)
+        except IndexError:
+            break
+        if start + length > len(buffer):
+            break
+        frames.append(decode_frame(buffer[start : start + length]))
+        pos = start + length
+    return frames, pos
+
+
+def decode_frame(body):
+    # HELLO -> (HELLO, rows, cols, seed)
+    # UPDATE -> (UPDATE, ack, score, flags, [(cell, color), ...])
+    kind = body[0]
+    if kind == HELLO:
+        rows, pos = read_varint(body, 1)
+        cols, pos = read_varint(body, pos)
+        seed, pos = read_varint(body, pos)
+        return HELLO, rows, cols, seed
+
+    ack, pos = read_varint(body, 1)
+    score, pos = read_varint(body, pos)
+    flags = body[pos]
+    count, pos = read_varint(body, pos + 1)
+    changes = []
+    for _ in range(count):
+        cell, pos = read_varint(body, pos)
+        changes.append((cell, body[pos]))
+        pos += 1
+    return UPDATE, ack, score, flags, changes
+
+
+class Session(asyncio.Protocol):
+    # one game per connection, keys are played as they arrive, gravity ticks
+    # when the session's timer fires, both answered with one update
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.timer = None
+
+    def connection_made(self, transport):
+        server = self.server
+        rules = server.rules
+        self.transport = transport
+        self.seed = server.next_seed()
+        self.game = new_game(self.seed, rules=rules)
+        self.loop = GameLoop(
+            self.game, server.gravity, server.speedup, clock=server.event_loop.time
+        )
+        # what the client shows, flat, to diff the next view against
+        self.sent = np.zeros(rules.grid_row * rules.grid_col, dtype=np.uint8)
+        # key bytes read, and how many of them `advance()` played
+        self.keys = 0
+        self.played = 0
+        self.acked = 0
+        self.score = 0
+        self.flags = 0
+
+        server.sessions.add(self)
+        server.opened += 1
+        transport.write(encode_hello(rules, self.seed))
+        self.send_update(force=True)
+        # starts the session's simulation clock
+        self.loop.advance()
+        self.schedule()
+
+    def connection_lost(self, exc):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.server.sessions.discard(self)
+
+    def data_received(self, data):
+        for key in data:
+            if key == QUIT:
+                # keys before the `q` still play, the `q` itself isn't acked
+                self.advance()
+                self.transport.close()
+                return
+            self.keys += 1
+            action = KEY_BYTES.get(key)
+            if action is not None:
+                self.loop.push(action)
+                self.server.actions += 1
+
+        self.advance()
+
+    def advance(self):
+        # plays the queued keys & due ticks, acks the keys it played
+        self.loop.advance()
+        self.played = self.keys
+        self.send_update()
+
+    def schedule(self):
+        # next gravity tick, what's left of the interval after the last one
+        delay = max(0.0, self.loop.gravity_interval() - self.loop.lag)
+        self.timer = self.server.event_loop.call_later(delay, self.on_timer)
+
+    def on_timer(self):
+        if self.loop.advance():
+            self.send_update()
+        self.schedule()
+
+    def view(self):
+        # locked cells plus the falling shape, one `PALETTE` index per cell
+        game = self.game
+        view = game.cells.reshape(-1).copy()
+        if not game.is_game_over:
+            rows, cols = game.cells.shape
+            color = COLOR_INDEX[game.current_color]
+            for x, y in game.get_cells():
+                if x < rows:
+                    view[x * cols + y] = color
+        return view
+
+    def send_update(self, force=False):
+        game = self.game
+        view = self.view()
+        cells = np.flatnonzero(view != self.sent)
+        flags = GAME_OVER if game.is_game_over else 0
+        state = (self.played, game.score, flags)
+        changed = state != (self.acked, self.score, self.flags)
+        if not (force or changed or len(cells)):
+            return
+
+        colors = view[cells]
+        self.sent[cells] = colors
+        self.acked, self.score, self.flags = state
+        frame = encode_update(
+            self.played, game.score, flags, cells.tolist(), colors.tolist()
+        )
+        self.transport.write(frame)
+        self.server.updates += 1
+        self.server.bytes_sent += len(frame)
+
+
+class GameServer:
+    # session factory & counters, `seed` makes the sessions' seeds repeatable
+
+    def __init__(self, rules=None, gravity=GRAVITY, speedup=SPEEDUP, seed=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.gravity = gravity
+        self.speedup = speedup
+        self.seeds = random.Random(seed)
+        self.event_loop = None
+
+        self.sessions = set()
+        self.opened = 0
+        self.actions = 0
+        self.updates = 0
+        self.bytes_sent = 0
+
+    def next_seed(self):
+        return self.seeds.randrange(1 << 63)
+
+    async def start(self, host=HOST, port=PORT, path=None):
+        # listening `asyncio.Server`, unix socket at `path` when given
+        self.event_loop = asyncio.get_running_loop()
+        if path is not None:
+            return await self.event_loop.create_unix_server(
+                lambda: Session(self), path
+            )
+        return await self.event_loop.create_server(
+            lambda: Session(self), host, port
+        )
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "opened": self.opened,
+            "actions": self.actions,
+            "updates": self.updates,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+async def serve(server, host=HOST, port=PORT, path=None):
+    # until SIGINT / SIGTERM
+    listener = await server.start(host, port, path)
+    address = path or "%s:%d" % listener.sockets[0].getsockname()[:2]
+    print(f"listening on {address}", flush=True)
+
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        server.event_loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    listener.close()
+    for session in list(server.sessions):
+        session.transport.close()
+    await listener.wait_closed()
+    if path is not None and os.path.exists(path):
+        os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="host tetris sessions")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT, help="0 picks a free one")
+    parser.add_argument("--unix", help="unix socket path instead of tcp")
+    parser.add_argument("--size", default="20x10", help="ROWSxCOLS")
+    parser.add_argument("--gravity", type=float, default=GRAVITY)
+    parser.add_argument("--speedup", type=float, default=SPEEDUP)
+    parser.add_argument("--seed", type=int, default=None, help="session seeds")
+    args = parser.parse_args()
+
+    rows, cols = map(int, args.size.split("x"))
+    server = GameServer(get_rules(rows, cols), args.gravity, args.speedup, args.seed)
+    start = time.perf_counter()
+    asyncio.run(serve(server, args.host, args.port, args.unix))
+
+    elapsed = time.perf_counter() - start
+    stats = server.stats()
+    print(
+        f"{stats['opened']} sessions, {stats['actions']} actions, "
+        f"{stats['updates']} updates, {stats['bytes_sent'] / 2**20:.1f} MiB sent "
+        f"in {elapsed:.1f}s, cpu {time.process_time():.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
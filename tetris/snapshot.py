@@ -0,0 +1,106 @@
+# whole game state as one fixed layout numpy record
+#
+# a snapshot is a `snapshot_dtype(rules)` structured array: board cells,
+# current shape, rotation, position & color, score, lines, pieces, game over
+# and the full mersenne twister state of the game's `random.Random`, so a
+# restored game plays on exactly like the original
+# arrays of them are plain `.npy` files, `load_snapshots` maps them without
+# reading, fields are columns (`snaps["score"]`, `snaps["cells"]`)
+from functools import lru_cache
+
+import numpy as np
+
+from .constants import COLOR_INDEX, PALETTE
+from .rules import DEFAULT_RULES
+
+# `random.Random.getstate()` is (version, 624 words + position, gauss_next)
+RNG_VERSION = 3
+RNG_WORDS = 624
+
+
+@lru_cache(maxsize=None)
+def snapshot_dtype(rules=DEFAULT_RULES):
+    return np.dtype(
+        [
+            ("cells", np.uint8, (rules.grid_row, rules.grid_col)),
+            # index into `rules.shape_names`
+            ("shape", np.uint8),
+            ("rotation", np.uint8),
+            ("pos", np.int16, (2,)),
+            # `PALETTE` index, 0 when no shape was picked yet
+            ("color", np.uint8),
+            ("is_game_over", np.bool_),
+            ("score", np.int64),
+            ("lines", np.int64),
+            ("pieces", np.int64),
+            ("rng_words", np.uint32, (RNG_WORDS,)),
+            ("rng_pos", np.uint32),
+            # nan when the generator holds no spare gauss value
+            ("rng_gauss", np.float64),
+        ]
+    )
+
+
+def snapshot(game, out=None):
+    # -> 0-d record, or fills `out` (one element of a snapshot array)
+    if out is None:
+        out = np.zeros((), dtype=snapshot_dtype(game.rules))
+
+    out["cells"] = game.cells
+    out["shape"] = game.rules.shape_names.index(game.current_shape_type)
+    out["rotation"] = game.shape_index
+    out["pos"] = game.current_pos
+    out["color"] = COLOR_INDEX.get(game.current_color, 0)
+    out["is_game_over"] = game.is_game_over
+    out["score"] = game.score
+    out["lines"] = game.lines
+    out["pieces"] = game.pieces
+
+    _, words, gauss = game.rng.getstate()
+    out["rng_words"] = words[:RNG_WORDS]
+    out["rng_pos"] = words[RNG_WORDS]
+    out["rng_gauss"] = np.nan if gauss is None else gauss
+    return out
+
+
+def restore(game, snap):
+    # puts `game` in the snapshot's state, rules have to match
+    if snap.dtype != snapshot_dtype(game.rules):
+        raise ValueError(f"snapshot is not of a {game.rules} game")
+
+    game.cells[:] = snap["cells"]
+    game.board.update_cells()
+
+    game.current_shape_type = game.rules.shape_names[int(snap["shape"])]
+    game.shape_index = int(snap["rotation"])
+    game.current_shape = game.rules.shapes[game.current_shape_type][game.shape_index]
+    game.current_pos = tuple(snap["pos"].tolist())
+    color = int(snap["color"])
+    game.current_color = PALETTE[color] if color else None
+    game.is_game_over = bool(snap["is_game_over"])
+    game.score = int(snap["score"])
+    game.lines = int(snap["lines"])
+    game.pieces = int(snap["pieces"])
+    game.cleared_rows = []
+
+    words = tuple(snap["rng_words"].tolist()) + (int(snap["rng_pos"]),)
+    gauss = float(snap["rng_gauss"])
+    game.rng.setstate((RNG_VERSION, words, None if np.isnan(gauss) else gauss))
+    game.clear_queue()
+
+
+def new_snapshots(count, rules=DEFAULT_RULES, path=None):
+    # `count` empty snapshots, in memory or as a writable mapped `.npy` file
+    dtype = snapshot_dtype(rules)
+    if path is None:
+        return np.zeros(count, dtype=dtype)
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(count,))
+
+
+def save_snapshots(path, snaps):
+    np.save(path, snaps)
+
+
+def load_snapshots(path, mmap=True):
+    # read only memory map by default, pages load as fields are touched
+    return np.load(path, mmap_mode="r" if mmap else None)
@@ -0,0 +1,148 @@
+# plays seeded games of a bot policy across a process pool
+#
+# a policy is a picklable callable `policy(game) -> actions` called once per
+# new shape with the `TetrisEngine`, the actions are played in order and the
+# shape is hard dropped if it didn't lock by then
+#
+# run: python -m tetris.tournament tetris.tournament:lowest_column_policy \
+#          --games 1000 --workers 8 --report report.json
+import argparse
+import csv
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .engine import DROP, LEFT, RIGHT
+from .features import column_heights
+from .replay import new_game
+
+STATS = ("score", "lines", "pieces", "duration")
+PERCENTILES = (50, 90, 99)
+
+
+def lowest_column_policy(game):
+    # slides the shape over the lowest column, no rotation
+    heights = column_heights(game.bool_grid)
+    target = int(heights.argmin())
+
+    left = min(game.current_pos[1] + dy for _, dy in game.current_shape)
+    if target > left:
+        return [RIGHT] * (target - left)
+    return [LEFT] * (left - target)
+
+
+def play_game(policy, seed, max_pieces=None):
+    game = new_game(seed)
+    start = time.perf_counter()
+
+    while not game.is_game_over:
+        if max_pieces is not None and game.pieces >= max_pieces:
+            break
+
+        pieces = game.pieces
+        for action in policy(game):
+            game.step(action)
+            if game.pieces != pieces or game.is_game_over:
+                break
+        else:
+            game.step(DROP)
+
+    return {
+        "seed": seed,
+        "score": game.score,
+        "lines": game.lines,
+        "pieces": game.pieces,
+        "duration": time.perf_counter() - start,
+    }
+
+
+def play_games(policy, seeds, max_pieces=None):
+    return [play_game(policy, seed, max_pieces) for seed in seeds]
+
+
+def run_tournament(policy, seeds, workers=None, chunk_size=16, max_pieces=None):
+    # yields per game results as worker chunks finish
+    seeds = list(seeds)
+    chunks = [seeds[i : i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(play_games, policy, chunk, max_pieces) for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def summarize(results, elapsed):
+    summary = {"games": len(results), "elapsed": elapsed}
+    summary["games_per_second"] = len(results) / elapsed if elapsed else 0.0
+
+    if not results:
+        # no games, every stat is empty
+        summary.update((stat, {}) for stat in STATS)
+        return summary
+
+    for stat in STATS:
+        values = np.array([result[stat] for result in results], dtype=np.float64)
+        summary[stat] = {"mean": float(values.mean()), "max": float(values.max())}
+        for p in PERCENTILES:
+            summary[stat][f"p{p}"] = float(np.percentile(values, p))
+
+    return summary
+
+
+def write_report(path, summary, results):
+    # `.csv` writes one row per game, anything else json with the summary
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["seed", *STATS])
+            writer.writeheader()
+            writer.writerows(sorted(results, key=lambda result: result["seed"]))
+        return
+
+    with open(path, "w") as f:
+        json.dump({"summary": summary, "games": results}, f, indent=2)
+
+
+def load_policy(name):
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="play seeded games of a policy")
+    parser.add_argument("policy", help="module:callable")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-pieces", type=int, default=None)
+    parser.add_argument("--report", default=None, help="report .json or .csv")
+    args = parser.parse_args()
+
+    policy = load_policy(args.policy)
+    seeds = range(args.first_seed, args.first_seed + args.games)
+
+    start = time.perf_counter()
+    results = list(
+        run_tournament(policy, seeds, args.workers, max_pieces=args.max_pieces)
+    )
+    summary = summarize(results, time.perf_counter() - start)
+
+    for stat in STATS:
+        values = "  ".join(f"{k} {v:.2f}" for k, v in summary[stat].items())
+        print(f"{stat:>8}: {values}")
+    print(
+        f"{summary['games']} games on {args.workers} workers, "
+        f"{summary['games_per_second']:.1f} games/s"
+    )
+
+    if args.report:
+        write_report(args.report, summary, results)
+
+
+if __name__ == "__main__":
+    main()